@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 # -------------------------------
@@ -14,14 +15,99 @@ OUTPUT_DIR = DATA_DIR / "output"
 # -------------------------------
 INPUT_FILE = INPUT_DIR / "My Clippings.txt"
 EXCEL_FILE = OUTPUT_DIR / "quotes.xlsx"
-CACHE_FILE = DATA_DIR / "quote_cache.json"
+IDEMPOTENCY_FILE = DATA_DIR / "import_state.sqlite3"
+CHECKPOINT_FILE = DATA_DIR / "clippings_checkpoint.json"
+JOURNAL_FILE = DATA_DIR / "import_journal.jsonl"
+SOURCE_STATE_FILE = DATA_DIR / "source_state.json"
+TRANSLATION_CACHE_FILE = DATA_DIR / "translation_cache.sqlite3"
+GLOSSARY_FILE = DATA_DIR / "glossary.tsv"
+GLOSSARY_OVERRIDES_FILE = DATA_DIR / "glossary_overrides.tsv"
+
+# Caches JSON antigos (migrados uma vez para o IDEMPOTENCY_FILE)
+LEGACY_QUOTE_CACHE_FILE = DATA_DIR / "quote_cache.json"
+LEGACY_VOCABULARY_CACHE_FILE = DATA_DIR / "vocabulary_cache.json"
 
 # -------------------------------
 # Backup (Kindle)
 # -------------------------------
-BACKUP_DIR = Path(r"C:\Users\marci\Desktop\myclippings_backup")
+BACKUP_DIR = Path(
+    os.environ.get("MYQUOTES_BACKUP_DIR")
+    or (
+        r"C:\Users\marci\Desktop\myclippings_backup"
+        if os.name == "nt"
+        else DATA_DIR / "backup"
+    )
+)
+
+# -------------------------------
+# Clippings sources
+# -------------------------------
+# Fontes consultadas em ordem; a primeira que tiver o arquivo vence.
+#   local   arquivo apontado por CLIPPINGS_PATH
+#   device  Kindle montado (letras de unidade / /media, /run/media, /mnt, /Volumes)
+#   mtp     Kindle via MTP (só Windows; plugin opcional, precisa de pywin32)
+#   inbox   My Clippings*.txt mais recente em INBOX_DIR
+#   backup  cópia de BACKUP_DIR
+CLIPPINGS_SOURCES = os.environ.get(
+    "MYQUOTES_SOURCES", "local,device,mtp,inbox,backup"
+).split(",")
+
+CLIPPINGS_PATH = os.environ.get("MYQUOTES_CLIPPINGS")
+INBOX_DIR = Path(os.environ.get("MYQUOTES_INBOX_DIR") or DATA_DIR / "inbox")
+
+# Pontos de montagem (glob) onde procurar documents/My Clippings.txt
+DEVICE_MOUNT_GLOBS = ["/media/*/*", "/run/media/*/*", "/mnt/*", "/Volumes/*"]
+
+# --watch: intervalo de polling e tempo sem mudanças antes de importar (s)
+WATCH_INTERVAL = 1.0
+WATCH_DEBOUNCE = 2.0
+
+# -------------------------------
+# Processing
+# -------------------------------
+# Workers para finalizar livros em paralelo (1 = serial)
+PROCESS_WORKERS = 1
+
+# Aceita plural / -ed / -ing do termo de vocabulário no trecho
+VOCABULARY_INFLECTIONS = False
+
+# Gera o quotes.xlsx como artefato (o import não depende dele)
+EXPORT_EXCEL = False
+
+# -------------------------------
+# Translation
+# -------------------------------
+# Endpoint (sobrescrevível para apontar a um servidor local em testes de carga)
+TRANSLATION_ENDPOINT = os.environ.get(
+    "MYQUOTES_TRANSLATION_ENDPOINT",
+    "https://translate.googleapis.com/translate_a/single",
+)
+
+# Timeout por requisição (segundos) e retries em 429 / 5xx / falha de conexão
+TRANSLATION_TIMEOUT = 15
+TRANSLATION_RETRIES = 4
+TRANSLATION_BACKOFF = 0.5
+TRANSLATION_BACKOFF_MAX = 20
+
+# Requisições simultâneas (threads)
+TRANSLATION_WORKERS = 16
+
+# Token bucket: requisições por segundo e rajada máxima (0 = sem limite)
+TRANSLATION_RATE = 25
+TRANSLATION_BURST = 25
+
+# Vários segmentos por requisição (separados por quebra de linha)
+TRANSLATION_BATCH_CHARS = 1800
+TRANSLATION_BATCH_SEGMENTS = 128
+
+# Cache persistente: entradas mantidas (LRU) e modo só-cache (sem rede)
+TRANSLATION_CACHE_MAX_ENTRIES = 50_000
+TRANSLATION_OFFLINE = False
 
 # -------------------------------
 # Import rules
 # -------------------------------
 CUTOFF_BOOK_ID = 63
+
+# Linhas por commit (quotes / vocabulary)
+IMPORT_BATCH_SIZE = 500
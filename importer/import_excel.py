@@ -1,39 +1,152 @@
+import argparse
 import time
 
-from importer.kindle.kindle_copy import copy_from_kindle
-from importer.processing.clippings import process_clippings
-from importer.persistence.import_db import import_from_excel
-from importer.persistence.import_vocabulary import import_vocabulary
-from importer.persistence.backup_supabase import backup_db
-from importer.config import INPUT_FILE, EXCEL_FILE
+from importer.kindle.kindle_copy import copy_clippings, locate_clippings
+from importer.processing.source_fingerprint import (
+    save_source_fingerprint,
+    source_fingerprint,
+)
+from importer.persistence.run_journal import RunJournal
+from importer.persistence.idempotency_store import IdempotencyStore
+from importer.config import INPUT_FILE, EXCEL_FILE, EXPORT_EXCEL
 
+# Os estágios (pandas, Flask-SQLAlchemy, requests) são importados dentro
+# de run_pipeline(), depois da checagem da fonte: um run sem mudanças sai sem
+# pagar esse custo de import.
 
-def main():
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MyQuotes import pipeline")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="continua do último lote commitado de um run interrompido",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="traduz só a partir do cache de traduções (sem rede)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="processa mesmo que o My Clippings.txt não tenha mudado desde o último run",
+    )
+    parser.add_argument(
+        "--reconcile",
+        nargs="?",
+        const="rebuild",
+        choices=["check", "rebuild"],
+        help="compara as chaves importadas com o DB (check) ou refaz o store a partir dele (rebuild, padrão) e sai",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="fica observando as fontes e importa a cada My Clippings.txt novo",
+    )
+    args = parser.parse_args(argv)
+
+    if args.reconcile:
+        from importer.persistence.reconcile import reconcile
+
+        print("🔎 Reconciling import state with the database...")
+        reconcile(rebuild=args.reconcile == "rebuild")
+        return
+
+    if args.watch:
+        _watch(args)
+        return
+
+    run_pipeline(args)
+
+
+def _watch(args: argparse.Namespace):
+    from importer.kindle.watch import watch
+
+    def run():
+        run_pipeline(args)
+        # --force / --resume valem só para o primeiro run
+        args.force = args.resume = False
+
+    try:
+        watch(run)
+    except KeyboardInterrupt:
+        print("👋 Watch stopped.")
+
+
+def run_pipeline(args: argparse.Namespace):
     print("🔄 Starting MyQuotes import pipeline...")
 
-    if not copy_from_kindle():
+    located = locate_clippings()
+    if located is None:
         print("❌ Operation cancelled — Kindle not found.")
         return
 
+    # ⏭️ antes de qualquer cópia: fonte igual à do último run → nada a fazer
+    source, found = located
+    fingerprint, unchanged = source_fingerprint(source, found)
+    if unchanged and not (args.force or args.resume):
+        print("⏭️ My Clippings.txt unchanged since the last run — nothing to import (use --force to reprocess).")
+        return
+
+    if not copy_clippings(source, found):
+        print("❌ Operation cancelled — could not copy My Clippings.txt.")
+        return
+
+    from importer.processing.clippings import process_clippings
+    from importer.persistence.import_db import import_quotes
+    from importer.persistence.import_vocabulary import import_vocabulary
+    from importer.persistence.book_registry import BookRegistry
+    from importer.services.translation_service import TranslationService
+
+    if args.offline:
+        TranslationService.offline = True
+
     print("📖 Processing My Clippings...")
-    ratings_detected, vocabularies_detected = process_clippings(
+    quotes_detected, ratings_detected, vocabularies_detected = process_clippings(
         input_file=INPUT_FILE,
-        output_excel=EXCEL_FILE
+        output_excel=EXCEL_FILE if EXPORT_EXCEL else None
     )
 
     time.sleep(1)
 
-    print("📥 Importing quotes into database...")
-    import_from_excel(ratings_detected)
+    journal = RunJournal.open(resume=args.resume)
 
-    time.sleep(1)
+    # 📚 livros e chaves já importadas, compartilhados pelos dois estágios
+    books = BookRegistry()
+    store = IdempotencyStore()
+
+    try:
+        print("📥 Importing quotes into database...")
+        import_quotes(
+            quotes_detected,
+            ratings_detected,
+            journal=journal,
+            books=books,
+            store=store,
+        )
+
+        time.sleep(1)
+
+        print("📘 Importing vocabulary into database...")
+        import_vocabulary(
+            vocabularies_detected,
+            journal=journal,
+            books=books,
+            store=store,
+        )
+
+        journal.finish()
+    finally:
+        store.close()
 
-    print("📘 Importing vocabulary into database...")
-    import_vocabulary(vocabularies_detected)
+    # ✅ só depois de um run completo
+    save_source_fingerprint(fingerprint, INPUT_FILE)
 
     time.sleep(1)
 
     # print("💾 Creating Supabase SQL backup...")
+    # from importer.persistence.backup_supabase import backup_db
     # backup_db()
 
     print("✅ Import pipeline finished successfully.")
@@ -1,41 +1,34 @@
 import shutil
-import time
-from pathlib import Path
-import win32com.client
 
 from importer.config import INPUT_DIR, INPUT_FILE, BACKUP_DIR
+from importer.kindle.sources import CLIPPINGS_NAME, ClippingsSource, configured_sources
 
 
-def find_kindle_file():
-    print("🔍 Procurando o Kindle conectado...")
+def locate_clippings(sources: list[ClippingsSource] | None = None):
+    """
+    Primeira fonte (na ordem configurada) com o My Clippings.txt.
+    Retorna (fonte, handle) ou None. Não copia nada: o chamador decide,
+    pelo fingerprint, se vale a pena copiar.
+    """
+    if sources is None:
+        sources = configured_sources()
 
-    possible_drives = [f"{chr(c)}:" for c in range(65, 91)]
-    for drive in possible_drives:
-        kindle_path = Path(f"{drive}\\documents\\My Clippings.txt")
-        if kindle_path.exists():
-            print(f"📗 Kindle detectado via unidade ({drive})")
-            return kindle_path
+    print(f"🔍 Procurando o My Clippings.txt ({', '.join(s.name for s in sources)})...")
 
-    shell = win32com.client.Dispatch("Shell.Application")
-    for item in shell.NameSpace(17).Items():
-        if "Kindle" in item.Name:
-            print(f"📘 Kindle detectado via MTP: {item.Name}")
-            try:
-                kindle_ns = item.GetFolder
-                docs_folder = kindle_ns.ParseName("Internal storage").GetFolder
-                documents = docs_folder.ParseName("documents").GetFolder
-                my_clippings = documents.ParseName("My Clippings.txt")
-                if my_clippings:
-                    print("✅ Arquivo My Clippings.txt encontrado (modo MTP)!")
-                    return my_clippings
-            except Exception:
-                pass
+    for source in sources:
+        found = source.find()
+        if found is not None:
+            return source, found
 
-    print("⚠️ Kindle não encontrado.")
+    # ─────────────────────────────────────────────
+    # 🔴 Nenhuma fonte disponível
+    # ─────────────────────────────────────────────
+    print("❌ Nenhum Kindle conectado e nenhum backup encontrado.")
+    print("➡️ Conecte o Kindle ou forneça um My Clippings.txt no BACKUP_DIR.")
     return None
 
 
-def copy_from_kindle():
+def copy_clippings(source: ClippingsSource, found) -> bool:
     print("📥 Iniciando obtenção do My Clippings.txt...\n")
     print(f"📌 INPUT_DIR = {INPUT_DIR}")
     print(f"📌 INPUT_FILE = {INPUT_FILE}")
@@ -44,60 +37,14 @@ def copy_from_kindle():
     BACKUP_DIR.mkdir(parents=True, exist_ok=True)
     INPUT_DIR.mkdir(parents=True, exist_ok=True)
 
-    backup_path = BACKUP_DIR / "My Clippings.txt"
-
-    kindle_item = find_kindle_file()
-
-    # ─────────────────────────────────────────────
-    # 🟢 CASO 1: Kindle conectado → usar Kindle
-    # ─────────────────────────────────────────────
-    if kindle_item:
-        try:
-            if isinstance(kindle_item, Path):
-                shutil.copy2(kindle_item, INPUT_FILE)
-                shutil.copy2(kindle_item, backup_path)
-                print(f"✅ Copiado via unidade: {kindle_item}")
-
-            else:
-                shell = win32com.client.Dispatch("Shell.Application")
-                target_ns = shell.NameSpace(str(INPUT_DIR))
-
-                print("📄 Copiando via MTP (isso pode levar alguns segundos)...")
-                target_ns.CopyHere(kindle_item, 16)
-
-                found = None
-                for _ in range(30):  # ~15s
-                    candidates = list(INPUT_DIR.glob("My Clippings*.txt"))
-                    if candidates:
-                        found = max(candidates, key=lambda p: p.stat().st_mtime)
-                        break
-                    time.sleep(0.5)
-
-                if not found or not found.exists():
-                    raise FileNotFoundError("Falha ao copiar via MTP (arquivo não apareceu no INPUT_DIR)")
-
-                if found.resolve() != INPUT_FILE.resolve():
-                    if INPUT_FILE.exists():
-                        INPUT_FILE.unlink()
-                    found.replace(INPUT_FILE)
-
-                shutil.copy2(INPUT_FILE, backup_path)
-
-            print(f"✅ Backup atualizado em: {backup_path}")
-            print(f"✅ Arquivo atualizado no INPUT_DIR: {INPUT_FILE}")
-            print("📚 Usando arquivo do Kindle.\n")
-            return True
-
-        except Exception as e:
-            print(f"❌ Erro ao copiar do Kindle: {e}")
-            return False
+    backup_path = BACKUP_DIR / CLIPPINGS_NAME
 
     # ─────────────────────────────────────────────
-    # 🟡 CASO 2: Kindle ausente → usar BACKUP
+    # 🟡 Backup: nenhuma outra fonte disponível
     # ─────────────────────────────────────────────
-    if backup_path.exists():
+    if source.is_backup:
         try:
-            shutil.copy2(backup_path, INPUT_FILE)
+            source.copy(found, INPUT_FILE)
             print("📂 Kindle não conectado.")
             print(f"✅ Usando backup existente: {backup_path}")
             print(f"✅ Arquivo copiado para INPUT_DIR: {INPUT_FILE}")
@@ -108,8 +55,18 @@ def copy_from_kindle():
             return False
 
     # ─────────────────────────────────────────────
-    # 🔴 CASO 3: Nenhuma fonte disponível
+    # 🟢 Kindle / arquivo novo → atualiza INPUT e backup
     # ─────────────────────────────────────────────
-    print("❌ Nenhum Kindle conectado e nenhum backup encontrado.")
-    print("➡️ Conecte o Kindle ou forneça um My Clippings.txt no BACKUP_DIR.")
-    return False
+    try:
+        source.copy(found, INPUT_FILE)
+        shutil.copy2(INPUT_FILE, backup_path)
+
+        print(f"✅ Copiado via {source.name}")
+        print(f"✅ Backup atualizado em: {backup_path}")
+        print(f"✅ Arquivo atualizado no INPUT_DIR: {INPUT_FILE}")
+        print("📚 Usando arquivo do Kindle.\n")
+        return True
+
+    except Exception as e:
+        print(f"❌ Erro ao copiar de {source.name}: {e}")
+        return False
@@ -0,0 +1,63 @@
+import time
+from pathlib import Path
+
+import win32com.client
+
+from importer.kindle.sources import CLIPPINGS_NAME, ClippingsSource
+
+
+class MtpSource(ClippingsSource):
+    """
+    Kindle conectado via MTP (Windows Shell). Plugin opcional: este
+    módulo só é importado por sources._mtp_source.
+    """
+
+    name = "mtp"
+
+    def find(self):
+        shell = win32com.client.Dispatch("Shell.Application")
+        for item in shell.NameSpace(17).Items():
+            if "Kindle" in item.Name:
+                print(f"📘 Kindle detectado via MTP: {item.Name}")
+                try:
+                    kindle_ns = item.GetFolder
+                    docs_folder = kindle_ns.ParseName("Internal storage").GetFolder
+                    documents = docs_folder.ParseName("documents").GetFolder
+                    my_clippings = documents.ParseName(CLIPPINGS_NAME)
+                    if my_clippings:
+                        print("✅ Arquivo My Clippings.txt encontrado (modo MTP)!")
+                        return my_clippings
+                except Exception:
+                    pass
+
+        return None
+
+    def stat(self, found) -> tuple[int, int]:
+        # FolderItem do Shell: sem ler o arquivo do dispositivo
+        return int(found.Size), int(found.ModifyDate.timestamp() * 1_000_000_000)
+
+    def label(self, found) -> str:
+        return f"mtp:{found.Path}"
+
+    def copy(self, found, target: Path):
+        shell = win32com.client.Dispatch("Shell.Application")
+        target_ns = shell.NameSpace(str(target.parent))
+
+        print("📄 Copiando via MTP (isso pode levar alguns segundos)...")
+        target_ns.CopyHere(found, 16)
+
+        copied = None
+        for _ in range(30):  # ~15s
+            candidates = list(target.parent.glob("My Clippings*.txt"))
+            if candidates:
+                copied = max(candidates, key=lambda p: p.stat().st_mtime)
+                break
+            time.sleep(0.5)
+
+        if not copied or not copied.exists():
+            raise FileNotFoundError("Falha ao copiar via MTP (arquivo não apareceu no INPUT_DIR)")
+
+        if copied.resolve() != target.resolve():
+            if target.exists():
+                target.unlink()
+            copied.replace(target)
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import glob
+import importlib
+import os
+import shutil
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable
+
+from importer.config import (
+    BACKUP_DIR,
+    CLIPPINGS_PATH,
+    CLIPPINGS_SOURCES,
+    DEVICE_MOUNT_GLOBS,
+    INBOX_DIR,
+)
+
+
+CLIPPINGS_NAME = "My Clippings.txt"
+
+
+class ClippingsSource(ABC):
+    """
+    Origem do My Clippings.txt.
+
+    find() devolve um handle do arquivo (Path, ou o objeto do plugin)
+    ou None; copy() grava esse arquivo em target. stat() / label() dão
+    tamanho, mtime e identificação do arquivo sem copiá-lo (fingerprint).
+    watch_paths() lista os arquivos / diretórios que o --watch observa
+    (vazio = não observável).
+    """
+
+    name = "source"
+    is_backup = False
+
+    @abstractmethod
+    def find(self):
+        ...
+
+    def copy(self, found, target: Path):
+        if Path(found).resolve() != target.resolve():
+            shutil.copy2(found, target)
+
+    def stat(self, found) -> tuple[int, int]:
+        stat = Path(found).stat()
+        return stat.st_size, stat.st_mtime_ns
+
+    def label(self, found) -> str:
+        return str(Path(found).resolve())
+
+    def watch_paths(self) -> list[Path]:
+        return []
+
+
+class LocalFileSource(ClippingsSource):
+    """Um arquivo fixo (ex.: sincronizado por outra ferramenta)."""
+
+    name = "local"
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def find(self) -> Path | None:
+        return self.path if self.path.is_file() else None
+
+    def watch_paths(self) -> list[Path]:
+        return [self.path]
+
+
+class BackupSource(LocalFileSource):
+    name = "backup"
+    is_backup = True
+
+    def __init__(self, backup_dir: Path = BACKUP_DIR):
+        super().__init__(backup_dir / CLIPPINGS_NAME)
+
+    def watch_paths(self) -> list[Path]:
+        # a própria pipeline grava o backup; observar geraria um loop
+        return []
+
+
+class MountedDeviceSource(ClippingsSource):
+    """
+    Kindle montado como disco: <raiz>/documents/My Clippings.txt.
+    Windows: letras de unidade A–Z; demais: DEVICE_MOUNT_GLOBS.
+    """
+
+    name = "device"
+
+    def __init__(self, mount_globs: list[str] = DEVICE_MOUNT_GLOBS):
+        self.mount_globs = mount_globs
+
+    def _roots(self) -> list[Path]:
+        if os.name == "nt":
+            return [Path(f"{chr(c)}:\\") for c in range(65, 91)]
+
+        roots: list[Path] = []
+        for pattern in self.mount_globs:
+            roots.extend(Path(p) for p in sorted(glob.glob(pattern)))
+        return roots
+
+    def _candidates(self) -> list[Path]:
+        return [root / "documents" / CLIPPINGS_NAME for root in self._roots()]
+
+    def find(self) -> Path | None:
+        for path in self._candidates():
+            if path.is_file():
+                print(f"📗 Kindle detectado via unidade ({path.parent.parent})")
+                return path
+        return None
+
+    def watch_paths(self) -> list[Path]:
+        return self._candidates()
+
+
+class InboxDirectorySource(ClippingsSource):
+    """My Clippings*.txt mais recente largado num diretório de entrada."""
+
+    name = "inbox"
+
+    def __init__(self, inbox_dir: Path = INBOX_DIR):
+        self.inbox_dir = inbox_dir
+
+    def find(self) -> Path | None:
+        candidates = [p for p in self.inbox_dir.glob("My Clippings*.txt") if p.is_file()]
+        if not candidates:
+            return None
+
+        found = max(candidates, key=lambda p: p.stat().st_mtime)
+        print(f"📥 Arquivo encontrado no inbox: {found.name}")
+        return found
+
+    def watch_paths(self) -> list[Path]:
+        return [self.inbox_dir]
+
+
+def _mtp_source() -> ClippingsSource | None:
+    # plugin opcional: win32com só é importado aqui, e só no Windows
+    if os.name != "nt":
+        return None
+
+    try:
+        return importlib.import_module("importer.kindle.mtp").MtpSource()
+    except ImportError as e:
+        print(f"⚠️ Fonte MTP indisponível ({e}) — instale pywin32.")
+        return None
+
+
+SOURCE_FACTORIES: dict[str, Callable[[], ClippingsSource | None]] = {
+    "local": lambda: LocalFileSource(Path(CLIPPINGS_PATH)) if CLIPPINGS_PATH else None,
+    "device": MountedDeviceSource,
+    "mtp": _mtp_source,
+    "inbox": InboxDirectorySource,
+    "backup": BackupSource,
+}
+
+
+def configured_sources(names: list[str] = CLIPPINGS_SOURCES) -> list[ClippingsSource]:
+    """
+    Instancia as fontes na ordem configurada, pulando as indisponíveis
+    nesta plataforma / configuração.
+    """
+    sources: list[ClippingsSource] = []
+
+    for name in names:
+        name = name.strip()
+        if not name:
+            continue
+
+        factory = SOURCE_FACTORIES.get(name)
+        if factory is None:
+            print(f"⚠️ Fonte desconhecida ignorada: {name}")
+            continue
+
+        source = factory()
+        if source is not None:
+            sources.append(source)
+
+    return sources
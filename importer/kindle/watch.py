@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import time
+import traceback
+from pathlib import Path
+from typing import Callable
+
+from importer.config import WATCH_DEBOUNCE, WATCH_INTERVAL
+from importer.kindle.sources import ClippingsSource, configured_sources
+
+
+def _snapshot(sources: list[ClippingsSource]) -> tuple:
+    """
+    (arquivo, tamanho, mtime) de tudo que as fontes expõem. watch_paths()
+    é reavaliado a cada chamada: um Kindle montado depois entra sozinho.
+    """
+    entries = []
+
+    for source in sources:
+        for path in source.watch_paths():
+            files: list[Path] = (
+                sorted(path.glob("My Clippings*.txt")) if path.is_dir() else [path]
+            )
+            for f in files:
+                try:
+                    stat = f.stat()
+                except OSError:
+                    continue
+                entries.append((str(f), stat.st_size, stat.st_mtime_ns))
+
+    return tuple(entries)
+
+
+def watch(
+    run: Callable[[], None],
+    sources: list[ClippingsSource] | None = None,
+    interval: float = WATCH_INTERVAL,
+    debounce: float = WATCH_DEBOUNCE,
+):
+    """
+    Modo daemon: roda `run` uma vez e depois a cada mudança nas fontes.
+
+    Polling por stat() (funciona em qualquer SO e em volumes montados).
+    Debounce: uma rajada de gravações vira um run só, disparado quando
+    as fontes ficam `debounce` segundos sem mudar. A falha de um run é
+    logada e o watch continua.
+    """
+    if sources is None:
+        sources = configured_sources()
+
+    watched = [s.name for s in sources if s.watch_paths()]
+    print(
+        f"👀 Watch | sources: {', '.join(watched) or 'none'} | "
+        f"every {interval}s | debounce {debounce}s"
+    )
+
+    def safe_run():
+        try:
+            run()
+        except Exception:
+            print("❌ Import run failed — watch continues.")
+            traceback.print_exc()
+
+    # baseline tirado antes do run: gravação durante o import dispara outro
+    last = _snapshot(sources)
+    changed_at: float | None = None
+
+    safe_run()
+
+    while True:
+        time.sleep(interval)
+
+        current = _snapshot(sources)
+        if current != last:
+            last = current
+            changed_at = time.monotonic()
+            continue
+
+        if changed_at is not None and time.monotonic() - changed_at >= debounce:
+            changed_at = None
+            print("🔔 Clippings changed — starting import...")
+            safe_run()
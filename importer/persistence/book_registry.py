@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from sqlalchemy import update
+
+from app import db
+from models import Book
+
+
+def title_key(value: str) -> str:
+    """
+    Chave normalizada de título / autor: sem espaços nas pontas,
+    espaços internos colapsados e minúsculas.
+    """
+    return " ".join(value.split()).lower()
+
+
+@dataclass(slots=True)
+class BookEntry:
+    id: int
+    title: str
+    author: str | None
+    rating: float | None
+
+
+class BookRegistry:
+    """
+    Livros do DB carregados uma vez por run (um SELECT) e compartilhados
+    entre os estágios de quotes e vocabulary.
+
+    Guarda dados simples (não instâncias ORM): cada estágio roda no seu
+    próprio app_context / sessão.
+
+    Índices:
+        título normalizado            → livro de menor id
+        (título, autor) normalizados  → livro de menor id
+    """
+
+    def __init__(self):
+        self._loaded = False
+        self._by_id: dict[int, BookEntry] = {}
+        self._by_title: dict[str, BookEntry] = {}
+        self._by_title_author: dict[tuple[str, str], BookEntry] = {}
+        self._pending: dict[str, Book] = {}
+
+    def _index(self, entry: BookEntry):
+        self._by_id[entry.id] = entry
+        key = title_key(entry.title)
+        self._by_title.setdefault(key, entry)
+        if entry.author:
+            self._by_title_author.setdefault((key, title_key(entry.author)), entry)
+
+    def _ensure_loaded(self):
+        # precisa de app_context ativo
+        if self._loaded:
+            return
+
+        rows = db.session.execute(
+            db.select(Book.id, Book.title, Book.author, Book.rating).order_by(Book.id)
+        )
+        for book_id, title, author, rating in rows:
+            self._index(BookEntry(book_id, title, author, rating))
+
+        self._loaded = True
+
+    def get(self, title: str, author: str | None = None) -> BookEntry | None:
+        """
+        Resolve pelo par (título, autor) quando houver; senão só pelo título.
+        """
+        self._ensure_loaded()
+        key = title_key(title)
+
+        if author:
+            entry = self._by_title_author.get((key, title_key(author)))
+            if entry is not None:
+                return entry
+
+        return self._by_title.get(key)
+
+    def by_id(self, book_id: int) -> BookEntry:
+        return self._by_id[book_id]
+
+    def ids_by_title(self) -> dict[str, int]:
+        self._ensure_loaded()
+        return {key: entry.id for key, entry in self._by_title.items()}
+
+    def ids_by_title_author(self) -> dict[tuple[str, str], int]:
+        self._ensure_loaded()
+        return {key: entry.id for key, entry in self._by_title_author.items()}
+
+    def add(self, title: str, author: str | None):
+        """
+        Agenda um livro novo (se o título ainda não existe).
+        Só é gravado em flush_new().
+        """
+        self._ensure_loaded()
+        key = title_key(title)
+
+        if key in self._by_title or key in self._pending:
+            return
+
+        self._pending[key] = Book(title=title, author=author)
+
+    def flush_new(self) -> list[BookEntry]:
+        """
+        Cria os livros agendados em lote (um flush só) e os indexa.
+        """
+        if not self._pending:
+            return []
+
+        books = list(self._pending.values())
+        db.session.add_all(books)
+        db.session.flush()
+        self._pending.clear()
+
+        created = [BookEntry(b.id, b.title, b.author, b.rating) for b in books]
+        for entry in created:
+            self._index(entry)
+
+        return created
+
+    def set_ratings(self, ratings: dict[int, float]):
+        """
+        Atualiza ratings por id em um único UPDATE em lote.
+        """
+        if not ratings:
+            return
+
+        db.session.execute(
+            update(Book),
+            [{"id": book_id, "rating": rating} for book_id, rating in ratings.items()],
+        )
+
+        for book_id, rating in ratings.items():
+            self._by_id[book_id].rating = rating
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+from sqlalchemy import text
+
+from app import db
+
+
+# -------------------------------
+# Staging tables
+# -------------------------------
+QUOTE_STAGING = "quotes_staging"
+QUOTE_STAGING_COLUMNS = {
+    "book_id": "integer",
+    "location_start": "integer",
+    "location_end": "integer",
+    "text": "text",
+    "notes": "text",
+    "type": "integer",
+    "page": "integer",
+    "known": "integer",
+}
+
+VOCABULARY_STAGING = "vocabulary_staging"
+VOCABULARY_STAGING_COLUMNS = {
+    "book_id": "integer",
+    "location_start": "integer",
+    "location_end": "integer",
+    "text": "text",
+    "translation": "text",
+    "word": "text",
+    "translated_word": "text",
+    "page": "text",
+}
+
+
+# -------------------------------
+# Merge SQL (mesmas regras do import linha a linha)
+# -------------------------------
+# Chave lógica (book_id, location_start) não tem índice único no schema,
+# então o merge usa NOT EXISTS / min(id) em vez de ON CONFLICT.
+# Em duplicatas no DB, a quote mais antiga (menor id) é a atualizada,
+# como fazia o antigo .first().
+# Linhas "known" (chave já importada, conteúdo mudou) só passam pelo
+# UPDATE; a busca por inexistentes fica para as chaves desconhecidas.
+_TEXT_IS_LONGER = "length(s.text) > length(quotes.text)"
+_NOTE_FILLS = (
+    "(s.notes <> '' AND (quotes.notes IS NULL OR trim(quotes.notes) = ''))"
+)
+
+_UPDATE_QUOTES_SQL = f"""
+UPDATE quotes
+SET
+    text = CASE WHEN {_TEXT_IS_LONGER} THEN s.text ELSE quotes.text END,
+    notes = CASE WHEN {_NOTE_FILLS} THEN s.notes ELSE quotes.notes END,
+    type = s.type
+FROM {QUOTE_STAGING} s
+WHERE quotes.book_id = s.book_id
+  AND quotes.location_start = s.location_start
+  AND quotes.id = (
+      SELECT min(q2.id) FROM quotes q2
+      WHERE q2.book_id = s.book_id AND q2.location_start = s.location_start
+  )
+  AND ({_TEXT_IS_LONGER} OR {_NOTE_FILLS} OR quotes.type <> s.type)
+"""
+
+_INSERT_QUOTES_SQL = f"""
+INSERT INTO quotes (
+    book_id, text, notes, type, page, location_start, location_end, is_active
+)
+SELECT
+    s.book_id, s.text, s.notes, s.type, s.page, s.location_start, s.location_end, 1
+FROM {QUOTE_STAGING} s
+WHERE s.known = 0
+  AND NOT EXISTS (
+    SELECT 1 FROM quotes q
+    WHERE q.book_id = s.book_id AND q.location_start = s.location_start
+)
+RETURNING book_id, location_start
+"""
+
+_INSERT_VOCABULARY_SQL = f"""
+INSERT INTO vocabulary (
+    book_id, location_start, location_end, text, translation,
+    word, translated_word, notes, page, is_favorite, is_active, status
+)
+SELECT
+    s.book_id, s.location_start, s.location_end, s.text, s.translation,
+    s.word, s.translated_word, NULL, s.page, 0, 1, 'again'
+FROM {VOCABULARY_STAGING} s
+WHERE NOT EXISTS (
+    SELECT 1 FROM vocabulary v
+    WHERE v.book_id = s.book_id AND v.location_start = s.location_start
+)
+RETURNING book_id, location_start
+"""
+
+
+def _temp_table(connection, table: str) -> str:
+    # qualificado no schema temporário: nunca resolve para uma tabela permanente
+    schema = "pg_temp" if connection.dialect.name == "postgresql" else "temp"
+    return f"{schema}.{table}"
+
+
+def _create_staging(connection, table: str, columns: dict[str, str]):
+    connection.execute(text(f"DROP TABLE IF EXISTS {_temp_table(connection, table)}"))
+    ddl = ", ".join(f"{name} {sql_type}" for name, sql_type in columns.items())
+    on_commit = " ON COMMIT DROP" if connection.dialect.name == "postgresql" else ""
+    connection.execute(text(f"CREATE TEMPORARY TABLE {table} ({ddl}){on_commit}"))
+
+
+def _stage_rows(connection, table: str, columns: list[str], rows: list[tuple]):
+    """
+    PostgreSQL: COPY ... FROM STDIN na mesma conexão / transação da sessão.
+    Outros (SQLite): executemany.
+    """
+    if connection.dialect.name == "postgresql":
+        raw = connection.connection.driver_connection
+        with raw.cursor() as cursor:
+            with cursor.copy(
+                f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+            ) as copy:
+                for row in rows:
+                    copy.write_row(row)
+        return
+
+    placeholders = ", ".join(f":{c}" for c in columns)
+    connection.execute(
+        text(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"),
+        [dict(zip(columns, row)) for row in rows],
+    )
+
+
+def _merge_planned_quote(base: dict, row: dict):
+    # mesma chave repetida no mesmo run: aplica as regras de update na ordem
+    if len(row["text"]) > len(base["text"]):
+        base["text"] = row["text"]
+    if row["notes"] and not base["notes"].strip():
+        base["notes"] = row["notes"]
+    base["type"] = row["type"]
+
+
+def bulk_merge_quotes(planned: list[dict]) -> tuple[set[tuple[int, int]], int]:
+    """
+    Aplica as quotes planejadas no servidor:
+      - texto mais longo vence
+      - nota preenche quote sem nota
+      - tipo diferente é atualizado
+      - chave inexistente (e não known) é inserida
+    Retorna (chaves inseridas, quantidade de quotes atualizadas).
+    """
+    if not planned:
+        return set(), 0
+
+    merged: dict[tuple[int, int], dict] = {}
+    for row in planned:
+        key = (row["book_id"], row["location_start"])
+        if key in merged:
+            _merge_planned_quote(merged[key], row)
+        else:
+            merged[key] = dict(row)
+
+    columns = list(QUOTE_STAGING_COLUMNS)
+    connection = db.session.connection()
+
+    _create_staging(connection, QUOTE_STAGING, QUOTE_STAGING_COLUMNS)
+    _stage_rows(
+        connection,
+        QUOTE_STAGING,
+        columns,
+        [tuple(row[c] for c in columns) for row in merged.values()],
+    )
+
+    updated = connection.execute(text(_UPDATE_QUOTES_SQL)).rowcount
+    inserted = {
+        (book_id, loc_start)
+        for book_id, loc_start in connection.execute(text(_INSERT_QUOTES_SQL))
+    }
+
+    connection.execute(text(f"DROP TABLE {_temp_table(connection, QUOTE_STAGING)}"))
+    return inserted, updated
+
+
+def bulk_insert_vocabulary(planned: list[dict]) -> set[tuple[int, int]]:
+    """
+    Insere os vocabulários planejados (chaves ainda inexistentes no DB).
+    Retorna as chaves inseridas.
+    """
+    if not planned:
+        return set()
+
+    columns = list(VOCABULARY_STAGING_COLUMNS)
+    connection = db.session.connection()
+
+    _create_staging(connection, VOCABULARY_STAGING, VOCABULARY_STAGING_COLUMNS)
+    _stage_rows(
+        connection,
+        VOCABULARY_STAGING,
+        columns,
+        [tuple(row[c] for c in columns) for row in planned],
+    )
+
+    inserted = {
+        (book_id, loc_start)
+        for book_id, loc_start in connection.execute(text(_INSERT_VOCABULARY_SQL))
+    }
+
+    connection.execute(text(f"DROP TABLE {_temp_table(connection, VOCABULARY_STAGING)}"))
+    return inserted
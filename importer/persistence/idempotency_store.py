@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from importer.config import (
+    IDEMPOTENCY_FILE,
+    LEGACY_QUOTE_CACHE_FILE,
+    LEGACY_VOCABULARY_CACHE_FILE,
+)
+
+
+QUOTES_NAMESPACE = "quotes"
+VOCABULARY_NAMESPACE = "vocabulary"
+
+# limite de parâmetros por SELECT ... IN (...)
+_LOOKUP_CHUNK_SIZE = 500
+
+
+def quote_key(book_id: int, location_start: int) -> str:
+    return f"{book_id}|{location_start}"
+
+
+def vocabulary_key(book: str, location_start: int) -> str:
+    return f"{book.lower()}|{location_start}"
+
+
+class IdempotencyStore:
+    """
+    Chaves já commitadas no DB, por namespace (quotes / vocabulary),
+    em SQLite (WAL). Cada chave pode guardar um valor (ex.: fingerprint
+    do conteúdo da quote).
+
+    Substitui os antigos quote_cache.json / vocabulary_cache.json:
+    consulta por chave indexada (sem carregar o histórico inteiro) e
+    marcação em lote numa transação só. Na primeira abertura, os JSON
+    legados são importados e renomeados para *.migrated.
+    """
+
+    def __init__(
+        self,
+        path: Path = IDEMPOTENCY_FILE,
+        legacy_files: dict[str, Path] | None = None,
+    ):
+        self.path = path
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS marks (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT,
+                    PRIMARY KEY (namespace, key)
+                ) WITHOUT ROWID
+                """
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(marks)")}
+            if "value" not in columns:
+                self._conn.execute("ALTER TABLE marks ADD COLUMN value TEXT")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS meta (
+                    name TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                )
+                """
+            )
+
+        if legacy_files is None:
+            legacy_files = {
+                QUOTES_NAMESPACE: LEGACY_QUOTE_CACHE_FILE,
+                VOCABULARY_NAMESPACE: LEGACY_VOCABULARY_CACHE_FILE,
+            }
+        self._migrate_json(legacy_files)
+
+    # -------------------------------
+    # Migração (uma vez)
+    # -------------------------------
+    def _migrate_json(self, legacy_files: dict[str, Path]):
+        for namespace, legacy in legacy_files.items():
+            flag = f"migrated:{namespace}"
+
+            if self._conn.execute(
+                "SELECT 1 FROM meta WHERE name = ?", (flag,)
+            ).fetchone():
+                continue
+
+            keys = []
+            if legacy.exists():
+                try:
+                    data = json.loads(legacy.read_text(encoding="utf-8"))
+                    keys = [k for k, v in data.items() if v is True]
+                except Exception:
+                    print(f"⚠️ Cache legado corrompido — ignorado: {legacy}")
+
+            with self._conn:
+                self._insert(namespace, keys)
+                self._conn.execute(
+                    "INSERT INTO meta (name, value) VALUES (?, ?)",
+                    (flag, str(legacy)),
+                )
+
+            if legacy.exists():
+                legacy.replace(legacy.with_name(legacy.name + ".migrated"))
+                print(f"🗃️ Cache migrado | {legacy.name} → {namespace}: {len(keys)} chaves")
+
+    # -------------------------------
+    # Consulta / marcação
+    # -------------------------------
+    def marked(self, namespace: str, keys: Iterable[str]) -> set[str]:
+        """
+        Quais das chaves informadas já estão marcadas.
+        """
+        return set(self.values(namespace, keys))
+
+    def values(self, namespace: str, keys: Iterable[str]) -> dict[str, str | None]:
+        """
+        Chaves informadas que já estão marcadas → valor guardado
+        (None para chaves marcadas sem valor, ex.: migradas do JSON).
+        """
+        keys = list(dict.fromkeys(keys))
+        found: dict[str, str | None] = {}
+
+        for i in range(0, len(keys), _LOOKUP_CHUNK_SIZE):
+            chunk = keys[i:i + _LOOKUP_CHUNK_SIZE]
+            placeholders = ", ".join("?" * len(chunk))
+            found.update(
+                self._conn.execute(
+                    f"SELECT key, value FROM marks WHERE namespace = ? AND key IN ({placeholders})",
+                    (namespace, *chunk),
+                )
+            )
+
+        return found
+
+    def set_many(self, namespace: str, items: Iterable[tuple[str, str]]):
+        """
+        Marca (ou atualiza) chave → valor numa única transação.
+        """
+        with self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO marks (namespace, key, value) VALUES (?, ?, ?)
+                ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value
+                """,
+                ((namespace, key, value) for key, value in items),
+            )
+
+    def mark_many(self, namespace: str, keys: Iterable[str]):
+        """
+        Marca as chaves numa única transação (tudo ou nada).
+        """
+        with self._conn:
+            self._insert(namespace, keys)
+
+    def _insert(self, namespace: str, keys: Iterable[str]):
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO marks (namespace, key) VALUES (?, ?)",
+            ((namespace, key) for key in keys),
+        )
+
+    def delete_many(self, namespace: str, keys: Iterable[str]):
+        with self._conn:
+            self._conn.executemany(
+                "DELETE FROM marks WHERE namespace = ? AND key = ?",
+                ((namespace, key) for key in keys),
+            )
+
+    def items(self, namespace: str) -> Iterator[tuple[str, str | None]]:
+        """
+        Todas as chaves do namespace → valor, lidas do cursor sob demanda.
+        """
+        yield from self._conn.execute(
+            "SELECT key, value FROM marks WHERE namespace = ?", (namespace,)
+        )
+
+    def count(self, namespace: str) -> int:
+        return self._conn.execute(
+            "SELECT count(*) FROM marks WHERE namespace = ?", (namespace,)
+        ).fetchone()[0]
+
+    def close(self):
+        self._conn.close()
@@ -1,147 +1,185 @@
+from __future__ import annotations
+
 import pandas as pd
 
 from app import app, db
-from models import Book, Quote
-from importer.config import EXCEL_FILE
-from importer.persistence.cache import load_cache, save_cache
+from importer.config import CUTOFF_BOOK_ID, EXCEL_FILE, IMPORT_BATCH_SIZE
+from importer.persistence.idempotency_store import (
+    QUOTES_NAMESPACE,
+    IdempotencyStore,
+)
+from importer.persistence.bulk_load import bulk_merge_quotes
+from importer.persistence.book_registry import BookRegistry
+from importer.persistence.run_journal import QUOTES_STAGE, RunJournal
+from importer.persistence.quote_rows import (
+    EXCEL_COLUMNS,
+    normalize_quotes,
+    select_quotes,
+)
 
 
 DEFAULT_QUOTE_TYPE = 2  # 🟡 Amarelo (tipo padrão do domínio)
 
 
-def import_from_excel(ratings_detected):
+def _read_excel_quotes(excel_file) -> pd.DataFrame:
+    """
+    Lê o quotes.xlsx (artefato opcional) com as colunas renomeadas para os
+    campos dos quote records devolvidos por process_clippings.
+    """
+    return pd.read_excel(excel_file).rename(columns=EXCEL_COLUMNS)
+
+
+def import_from_excel(ratings_detected, excel_file=EXCEL_FILE, books=None):
+    import_quotes(_read_excel_quotes(excel_file), ratings_detected, books=books)
+
+
+def import_quotes(
+    quotes_detected: list[dict],
+    ratings_detected: list[dict],
+    journal: RunJournal | None = None,
+    batch_size: int = IMPORT_BATCH_SIZE,
+    books: BookRegistry | None = None,
+    store: IdempotencyStore | None = None,
+):
+    """
+    Importa os quote records de process_clippings direto no DB,
+    sem passar pelo Excel.
+
+    books: registry compartilhado com o import de vocabulary
+    (um SELECT de livros por run).
+
+    Commita a cada batch_size quotes; após cada commit as chaves do lote
+    são gravadas no IdempotencyStore com o fingerprint do conteúdo
+    (texto, nota, tipo) e registradas no journal (--resume). Quote com o
+    mesmo fingerprint é pulada sem acesso ao DB; conteúdo alterado vai
+    direto ao UPDATE.
+
+    Sem store, abre um próprio e o fecha ao final.
+    """
+    own_store = store is None
+    if own_store:
+        store = IdempotencyStore()
+
+    try:
+        _import_quotes(quotes_detected, ratings_detected, journal, batch_size, books, store)
+    finally:
+        if own_store:
+            store.close()
+
+
+def _import_quotes(
+    quotes_detected: list[dict],
+    ratings_detected: list[dict],
+    journal: RunJournal | None,
+    batch_size: int,
+    books: BookRegistry | None,
+    store: IdempotencyStore,
+):
     with app.app_context():
-        df = pd.read_excel(EXCEL_FILE)
-        cache = load_cache()
-        quotes_committed = set()
+        already_committed = journal.committed(QUOTES_STAGE) if journal else set()
 
         inserted = 0
         updated = 0
         skipped = 0
 
-        CUTOFF_BOOK_ID = 63
-
-        existing_books = {
-            b.title.lower(): b
-            for b in Book.query.all()
-        }
+        if books is None:
+            books = BookRegistry()
 
-        # ⭐ Apply ratings
+        # ⭐ Apply ratings (só livros que já existiam, a partir do cutoff)
+        ratings = {}
         for item in ratings_detected:
-            book = existing_books.get(item['book'].lower())
+            book = books.get(item['book'], item.get('author'))
             if not book or book.id < CUTOFF_BOOK_ID:
                 continue
 
             rating = item['rating']
+            current = ratings.get(book.id, book.rating)
 
-            if book.rating is None:
-                book.rating = rating
+            if current is None:
+                ratings[book.id] = rating
                 print(f"🟢 Rating set | {book.title} = {rating}")
-            elif abs(book.rating - rating) >= 0.1:
-                old = book.rating
-                book.rating = rating
-                print(f"🟡 Rating updated | {book.title}: {old} → {rating}")
+            elif abs(current - rating) >= 0.1:
+                ratings[book.id] = rating
+                print(f"🟡 Rating updated | {book.title}: {current} → {rating}")
             else:
                 print(f"⚪ Rating ignored | {book.title}")
 
-        for _, row in df.iterrows():
-            if pd.isna(row['Book']) or pd.isna(row['Quote']):
-                continue
-
-            book_title = row['Book'].strip()
-            book_key = book_title.lower()
-
-            book = existing_books.get(book_key)
-            if not book:
-                book = Book(
-                    title=book_title,
-                    author=row['Author'].strip() if pd.notna(row['Author']) else 'Unknown'
+        books.set_ratings(ratings)
+
+        # 🧹 Normalização vetorizada (trim, tipos, sem livro / sem quote)
+        frame, filtered = normalize_quotes(quotes_detected)
+
+        # 📚 Livros novos criados em lote (um flush só)
+        for title, author in (
+            frame.drop_duplicates("book_key")[["book", "author"]]
+            .itertuples(index=False)
+        ):
+            books.add(title, author)
+
+        books.flush_new()
+
+        # 🧹 Cutoff, tipo 0, sem posição e conteúdo inalterado (fingerprint)
+        planned, selected_filtered = select_quotes(
+            frame,
+            books.ids_by_title(),
+            books.ids_by_title_author(),
+            CUTOFF_BOOK_ID,
+            lambda keys: store.values(QUOTES_NAMESPACE, keys),
+            already_committed,
+        )
+        filtered.update(selected_filtered)
+
+        # sem livro / sem quote nunca contaram como skipped
+        skipped += sum(selected_filtered.values())
+        print(
+            "🧹 Filtered | "
+            + " | ".join(f"{rule}: {count}" for rule, count in filtered.items())
+        )
+
+        changed = sum(row["known"] for row in planned)
+        print(f"🧾 Fingerprints | changed: {changed} | unknown: {len(planned) - changed}")
+
+        # ⭐ ratings / livros novos já vão no primeiro commit
+        batches = [
+            planned[i:i + batch_size]
+            for i in range(0, len(planned), batch_size)
+        ] or [[]]
+
+        for number, batch in enumerate(batches, start=1):
+            # 🚚 Staging + merge no servidor (COPY no Postgres)
+            inserted_keys, batch_updated = bulk_merge_quotes(batch)
+            updated += batch_updated
+
+            batch_inserted = 0
+            for row in batch:
+                key = (row["book_id"], row["location_start"])
+                if key not in inserted_keys:
+                    continue
+
+                inserted_keys.discard(key)
+                batch_inserted += 1
+                print(
+                    f"🟢 Inserted | {books.by_id(row['book_id']).title} | "
+                    f"loc={row['location_start']}-{row['location_end']} | "
+                    f"type={row['type']}"
                 )
-                db.session.add(book)
-                db.session.flush()
-                existing_books[book_key] = book
-
-            if book.id < CUTOFF_BOOK_ID:
-                skipped += 1
-                continue
-
-            quote_text = row['Quote'].strip()
-            note_text = row['Note'].strip() if isinstance(row['Note'], str) else ''
-
-            quote_type = int(row['Type']) if not pd.isna(row['Type']) else 0
-            if quote_type == 0:
-                skipped += 1
-                continue
-
-            loc_start = int(row['LocationStart']) if not pd.isna(row['LocationStart']) else None
-            loc_end = int(row['LocationEnd']) if not pd.isna(row['LocationEnd']) else None
-            page = row['Page']
-
-            if loc_start is None:
-                skipped += 1
-                continue
 
-            cache_key = f"{book.id}|{loc_start}"
+            inserted += batch_inserted
+            skipped += len(batch) - batch_inserted
 
-            # ✅ Cache check
-            if cache.get(cache_key) is True:
-                skipped += 1
-                continue
-
-            existing_quote = Quote.query.filter(
-                Quote.book_id == book.id,
-                Quote.location_start == loc_start
-            ).first()
-
-            if existing_quote:
-                changed = False
-
-                if len(quote_text) > len(existing_quote.text):
-                    existing_quote.text = quote_text
-                    changed = True
-
-                if note_text and (not existing_quote.notes or existing_quote.notes.strip() == ''):
-                    existing_quote.notes = note_text
-                    changed = True
-
-                if existing_quote.type != quote_type:
-                    existing_quote.type = quote_type
-                    changed = True
-
-                if changed:
-                    updated += 1
+            db.session.commit()
 
-                quotes_committed.add(cache_key)
-                skipped += 1
-                continue
-
-            print(
-                f"🟢 Inserted | {book.title} | "
-                f"loc={loc_start}-{loc_end} | "
-                f"type={quote_type}"
-            )
-
-            new_quote = Quote(
-                book_id=book.id,
-                text=quote_text,
-                notes=note_text,
-                type=quote_type,
-                page=page if not pd.isna(page) else None,
-                location_start=loc_start,
-                location_end=loc_end,
-                is_active=True
+            # ✅ store e journal só depois do commit do lote
+            batch_keys = [row["cache_key"] for row in batch]
+            store.set_many(
+                QUOTES_NAMESPACE,
+                ((row["cache_key"], row["fingerprint"]) for row in batch),
             )
 
-            db.session.add(new_quote)
-            quotes_committed.add(cache_key)
-            inserted += 1
-
-        db.session.commit()
-
-        for key in quotes_committed:
-            cache[key] = True
+            if journal is not None:
+                journal.record_batch(QUOTES_STAGE, batch_keys)
 
-        save_cache(cache)
+            print(f"💾 Quotes batch {number}/{len(batches)} committed ({len(batch)} rows)")
 
         print("✅ Commit completed successfully.")
         print(f"🟢 Inserted: {inserted}")
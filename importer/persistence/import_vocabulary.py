@@ -2,33 +2,142 @@
 
 from __future__ import annotations
 
-from importer.persistence.vocabulary_cache import VocabularyCache
+from sqlalchemy import func
+
+from importer.persistence.idempotency_store import (
+    VOCABULARY_NAMESPACE,
+    IdempotencyStore,
+    vocabulary_key,
+)
+from importer.persistence.prefetch import prefetch_vocabulary_keys
+from importer.persistence.bulk_load import bulk_insert_vocabulary
+from importer.persistence.book_registry import BookRegistry
+from importer.persistence.run_journal import VOCABULARY_STAGE, RunJournal
+from importer.config import IMPORT_BATCH_SIZE
+from importer.services.glossary import Glossary, glossary_key
+from importer.services.translation_pool import translate_all
 from importer.services.translation_service import TranslationService
 
 from app import app, db
-from models import Book, Vocabulary
+from models import Vocabulary
+
+
+def _learn_glossary(glossary: Glossary) -> int:
+    """
+    Alimenta o glossário com as traduções de termos já gravadas
+    (vocabulary ativo). Por termo, vence a tradução mais frequente.
+    """
+    rows = db.session.execute(
+        db.select(Vocabulary.word, Vocabulary.translated_word, func.count())
+        .where(
+            Vocabulary.word.isnot(None),
+            Vocabulary.translated_word.isnot(None),
+            func.coalesce(Vocabulary.is_active, 1) == 1,
+        )
+        .group_by(Vocabulary.word, Vocabulary.translated_word)
+    )
+
+    best: dict[str, tuple[int, str]] = {}
+    for word, translated, count in rows:
+        key = glossary_key(word)
+        # termo devolvido sem tradução não ensina nada
+        if not key or glossary_key(translated) in ("", key):
+            continue
+
+        if key not in best or (count, translated) > best[key]:
+            best[key] = (count, translated)
+
+    return glossary.learn(
+        (key, translated) for key, (_, translated) in best.items()
+    )
 
 
-def import_vocabulary(vocabularies_detected: list[dict]):
+def _commit_batch(
+    batch: list[dict],
+    store: IdempotencyStore,
+    journal: RunJournal | None,
+) -> int:
     """
-    Persiste Vocabulary no DB e atualiza o VocabularyCache
-    SOMENTE após commit bem-sucedido.
+    Grava um lote, commita e só então marca store / journal.
+    Retorna quantos foram inseridos.
+    """
+    # 🚚 Staging + INSERT no servidor (COPY no Postgres)
+    inserted_keys = bulk_insert_vocabulary(batch)
+
+    db.session.commit()
+
+    if not batch:
+        return 0
+
+    batch_keys = [
+        vocabulary_key(row["book_title"], row["location_start"])
+        for row in batch
+    ]
+    store.mark_many(VOCABULARY_NAMESPACE, batch_keys)
+
+    if journal is not None:
+        journal.record_batch(VOCABULARY_STAGE, batch_keys)
+
+    print(f"💾 Vocabulary batch committed ({len(batch)} rows)")
+    return len(inserted_keys)
+
+
+def import_vocabulary(
+    vocabularies_detected: list[dict],
+    journal: RunJournal | None = None,
+    batch_size: int = IMPORT_BATCH_SIZE,
+    books: BookRegistry | None = None,
+    store: IdempotencyStore | None = None,
+):
+    """
+    Persiste Vocabulary no DB e marca as chaves no IdempotencyStore
+    SOMENTE após commit bem-sucedido (a cada batch_size itens).
+
+    books: registry compartilhado com o import de quotes.
+    Sem store, abre um próprio e o fecha ao final.
     """
     if not vocabularies_detected:
         print("📘 Vocabulary | nothing to import.")
         return
 
-    vocab_cache = VocabularyCache()
+    own_store = store is None
+    if own_store:
+        store = IdempotencyStore()
+
+    try:
+        _import_vocabulary(vocabularies_detected, journal, batch_size, books, store)
+    finally:
+        if own_store:
+            store.close()
+
+
+def _import_vocabulary(
+    vocabularies_detected: list[dict],
+    journal: RunJournal | None,
+    batch_size: int,
+    books: BookRegistry | None,
+    store: IdempotencyStore,
+):
+    already_committed = journal.committed(VOCABULARY_STAGE) if journal else set()
 
     inserted = 0
     skipped = 0
 
     with app.app_context():
-        # cache de livros por título (case-insensitive)
-        existing_books = {
-            b.title.lower(): b
-            for b in Book.query.all()
-        }
+        if books is None:
+            books = BookRegistry()
+
+        # 🔎 chaves já importadas, consultadas em lote
+        detected_keys = []
+        for v in vocabularies_detected:
+            book_title = (v.get("book") or "").strip()
+            loc_start = v.get("location_start")
+            if book_title and loc_start is not None:
+                detected_keys.append(vocabulary_key(book_title, int(loc_start)))
+
+        done_keys = store.marked(VOCABULARY_NAMESPACE, detected_keys) | already_committed
+
+        pending = []
 
         for v in vocabularies_detected:
             book_title = (v.get("book") or "").strip()
@@ -41,18 +150,12 @@ def import_vocabulary(vocabularies_detected: list[dict]):
                 skipped += 1
                 continue
 
-            # ✅ Cache check (idempotência)
-            if vocab_cache.exists(book_title, int(loc_start)):
+            # ✅ Idempotência (e lotes de um run interrompido)
+            if vocabulary_key(book_title, int(loc_start)) in done_keys:
                 skipped += 1
                 continue
 
-            book = existing_books.get(book_title.lower())
-            if not book:
-                # tenta encontrar no DB por ilike (fallback)
-                book = Book.query.filter(Book.title.ilike(book_title)).first()
-                if book:
-                    existing_books[book_title.lower()] = book
-
+            book = books.get(book_title, v.get("author"))
             if not book:
                 print(f"⚠️ Vocabulary skipped (book not found): {book_title}")
                 skipped += 1
@@ -63,83 +166,126 @@ def import_vocabulary(vocabularies_detected: list[dict]):
                 skipped += 1
                 continue
 
+            pending.append((v, book, book_title, int(loc_start), word))
+
+        # 🔎 chaves já gravadas dos livros afetados em poucos SELECTs
+        existing_keys = prefetch_vocabulary_keys({item[1].id for item in pending})
+
+        to_write = []
+        already_in_db = []
+
+        for v, book, book_title, loc_start, word in pending:
             # ✅ evita duplicata no DB também (mesma chave lógica)
-            existing_vocab = Vocabulary.query.filter(
-                Vocabulary.book_id == book.id,
-                Vocabulary.location_start == int(loc_start)
-            ).first()
-            if existing_vocab:
-                vocab_cache.mark(book_title, int(loc_start))
+            if (book.id, loc_start) in existing_keys:
+                already_in_db.append(vocabulary_key(book_title, loc_start))
                 skipped += 1
                 continue
 
+            existing_keys.add((book.id, loc_start))
+            to_write.append((v, book, book_title, loc_start, word))
+
+        # já estão no DB: podem ser marcadas de imediato
+        store.mark_many(VOCABULARY_NAMESPACE, already_in_db)
+
+        # 📖 Glossário local para os termos isolados (sem rede)
+        glossary = Glossary()
+        glossary_words = {}
+        if to_write:
+            learned = _learn_glossary(glossary)
+            for _, _, _, _, word in to_write:
+                translated = glossary.get(word)
+                if translated is not None:
+                    glossary_words[word] = translated
+            print(
+                f"📖 Glossary | {len(glossary)} terms | {learned} learned | "
+                f"{len(glossary_words)} words resolved locally"
+            )
+
+        # 🌍 Traduções em paralelo (trecho + termo), antes de gravar
+        translations = translate_all(
+            text
+            for v, _, _, _, word in to_write
+            for text in (
+                (v.get("text") or "").strip(),
+                word if word not in glossary_words else "",
+            )
+            if text
+        )
+        translations.update(glossary_words)
+        if to_write:
+            print(f"🗄️ Translation cache | {TranslationService.cache().summary()}")
+
+        planned = []
+
+        for v, book, book_title, loc_start, word in to_write:
             text_en = (v.get("text") or "").strip()
 
             translation = None
             translated_word = None
 
-            # 🔹 traduz trecho (sentence)
+            # 🔹 trecho (sentence)
             if text_en:
-                try:
-                    translation = TranslationService.translate_to_pt_br(text_en)
+                result = translations[text_en]
+                if isinstance(result, Exception):
                     print(
-                        f"🌍 ETL | Translated text | "
-                        f"Book: {book.title} | Word: {word}"
+                        f"⚠️ ETL | Text translation failed | "
+                        f"Book: {book.title} | Word: {word} | {result}"
                     )
-                except Exception as e:
+                else:
+                    translation = result
                     print(
-                        f"⚠️ ETL | Text translation failed | "
-                        f"Book: {book.title} | Word: {word} | {e}"
+                        f"🌍 ETL | Translated text | "
+                        f"Book: {book.title} | Word: {word}"
                     )
 
-            # 🔹 traduz termo isolado
-            try:
-                translated_word = TranslationService.translate_to_pt_br(word)
+            # 🔹 termo isolado
+            result = translations[word]
+            if isinstance(result, Exception):
                 print(
-                    f"🌍 ETL | Translated word | "
-                    f"Book: {book.title} | {word} → {translated_word}"
+                    f"⚠️ ETL | Word translation failed | "
+                    f"Book: {book.title} | Word: {word} | {result}"
                 )
-            except Exception as e:
+            else:
+                translated_word = result
                 print(
-                    f"⚠️ ETL | Word translation failed | "
-                    f"Book: {book.title} | Word: {word} | {e}"
+                    f"🌍 ETL | Translated word | "
+                    f"Book: {book.title} | {word} → {translated_word}"
                 )
 
-            vocab = Vocabulary(
-                book_id=book.id,
-                location_start=int(loc_start),
-                location_end=int(v.get("location_end") or loc_start),
-                text=text_en,
-                translation=translation,
-                word=word,
-                translated_word=translated_word,
-                notes=None,
-                page=v.get("page"),
-                is_active=1,
-                status="again",
-            )
+            page = v.get("page")
+            location_end = int(v.get("location_end") or loc_start)
 
-            db.session.add(vocab)
-            inserted += 1
+            planned.append({
+                "book_id": book.id,
+                "location_start": loc_start,
+                "location_end": location_end,
+                "text": text_en,
+                "translation": translation,
+                "word": word,
+                "translated_word": translated_word,
+                "page": str(page) if page is not None else None,
+                "book_title": book_title,
+            })
 
             print(
                 f"📘 Vocabulary queued | "
                 f"Book: {book.title} | "
                 f"Word: {word} | "
-                f"Location: {vocab.location_start}-{vocab.location_end}"
+                f"Location: {loc_start}-{location_end}"
             )
 
-        db.session.commit()
+            if len(planned) >= batch_size:
+                batch_inserted = _commit_batch(planned, store, journal)
+                inserted += batch_inserted
+                skipped += len(planned) - batch_inserted
+                planned = []
 
-        # ✅ só marca cache depois do commit
-        for v in vocabularies_detected:
-            book_title = (v.get("book") or "").strip()
-            loc_start = v.get("location_start")
-            if book_title and loc_start is not None:
-                vocab_cache.mark(book_title, int(loc_start))
+        batch_inserted = _commit_batch(planned, store, journal)
+        inserted += batch_inserted
+        skipped += len(planned) - batch_inserted
 
-        # ✅ persiste o cache
-        vocab_cache.save()
+        # ✅ só marca depois do commit
+        store.mark_many(VOCABULARY_NAMESPACE, detected_keys)
 
     print("✅ Vocabulary commit completed successfully.")
     print(f"🟢 Inserted: {inserted}")
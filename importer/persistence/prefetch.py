@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from models import Vocabulary
+
+
+PREFETCH_CHUNK_SIZE = 500
+
+
+def _chunks(values, size: int = PREFETCH_CHUNK_SIZE):
+    values = sorted(values)
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+def prefetch_vocabulary_keys(book_ids) -> set[tuple[int, int]]:
+    """
+    Chaves (book_id, location_start) de Vocabulary já gravadas
+    para os livros afetados.
+    """
+    keys: set[tuple[int, int]] = set()
+
+    for chunk in _chunks(book_ids):
+        rows = (
+            Vocabulary.query
+            .with_entities(Vocabulary.book_id, Vocabulary.location_start)
+            .filter(Vocabulary.book_id.in_(chunk))
+        )
+        keys.update((book_id, loc) for book_id, loc in rows)
+
+    return keys
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Callable, Iterable
+
+import numpy as np
+import pandas as pd
+
+
+# Campos dos quote records (process_clippings / quotes.xlsx)
+QUOTE_FIELDS = [
+    "book", "author", "page", "type", "quote", "note",
+    "location_start", "location_end",
+]
+
+# Cabeçalhos do quotes.xlsx → campos dos quote records
+EXCEL_COLUMNS = {
+    "Book": "book",
+    "Author": "author",
+    "Page": "page",
+    "Type": "type",
+    "Quote": "quote",
+    "Note": "note",
+    "LocationStart": "location_start",
+    "LocationEnd": "location_end",
+}
+
+# Regras na ordem em que são aplicadas (e contadas)
+RULE_NO_BOOK = "no book"
+RULE_NO_QUOTE = "no quote"
+RULE_CUTOFF = "before cutoff"
+RULE_TYPE_ZERO = "type 0"
+RULE_NO_LOCATION = "no location"
+RULE_UNCHANGED = "unchanged"
+
+_PLANNED_COLUMNS = [
+    "book_id", "location_start", "location_end", "text", "notes", "type",
+    "page", "cache_key", "fingerprint", "known",
+]
+
+
+def quote_frame(quotes) -> pd.DataFrame:
+    """
+    Aceita a lista de quote records ou um DataFrame já nesse formato.
+    """
+    if isinstance(quotes, pd.DataFrame):
+        return quotes
+    return pd.DataFrame.from_records(quotes, columns=QUOTE_FIELDS)
+
+
+def _text(series: pd.Series) -> pd.Series:
+    # só strings contam (NaN / números do Excel viram NA)
+    try:
+        return series.str.strip()
+    except AttributeError:
+        # coluna sem nenhuma string
+        return pd.Series(None, index=series.index, dtype=object)
+
+
+def _key(series: pd.Series) -> pd.Series:
+    # mesma normalização de book_registry.title_key
+    return series.str.split().str.join(" ").str.lower()
+
+
+def _integers(series: pd.Series) -> pd.Series:
+    numeric = pd.to_numeric(series, errors="coerce")
+    return np.trunc(numeric).astype("Int64")
+
+
+def _drop(frame: pd.DataFrame, mask: pd.Series, rule: str, filtered: dict) -> pd.DataFrame:
+    filtered[rule] = int(mask.sum())
+    return frame[~mask]
+
+
+def normalize_quotes(quotes) -> tuple[pd.DataFrame, dict[str, int]]:
+    """
+    Normaliza os quote records em operações de coluna:
+    trim das strings, tipos numéricos coeridos e linhas sem livro ou
+    sem quote descartadas.
+
+    Retorna (frame normalizado, linhas descartadas por regra).
+    """
+    raw = quote_frame(quotes)
+    filtered: dict[str, int] = {}
+
+    book = _text(raw["book"])
+    author = _text(raw["author"]).fillna("Unknown")
+    quote = _text(raw["quote"])
+
+    frame = pd.DataFrame({
+        "book": book,
+        "book_key": _key(book),
+        "author": author,
+        "author_key": _key(author),
+        "text": quote,
+        "notes": _text(raw["note"]).fillna(""),
+        "type": _integers(raw["type"]).fillna(0),
+        "page": _integers(raw["page"]),
+        "location_start": _integers(raw["location_start"]),
+        "location_end": _integers(raw["location_end"]),
+    }, index=raw.index)
+
+    frame = _drop(frame, book.isna() | book.eq(""), RULE_NO_BOOK, filtered)
+    frame = _drop(frame, frame["text"].isna() | frame["text"].eq(""), RULE_NO_QUOTE, filtered)
+
+    return frame, filtered
+
+
+def _book_ids(
+    frame: pd.DataFrame,
+    title_ids: dict[str, int],
+    title_author_ids: dict[tuple[str, str], int],
+) -> pd.Series:
+    # (título, autor) primeiro; só título quando o par não existe
+    pairs = pd.MultiIndex.from_arrays([frame["book_key"], frame["author_key"]])
+    by_pair = pd.Series(pairs.map(title_author_ids), index=frame.index)
+    return by_pair.fillna(frame["book_key"].map(title_ids)).astype("int64")
+
+
+def quote_content(text: str, notes: str, quote_type) -> str:
+    return f"{text}\x1f{notes}\x1f{quote_type}"
+
+
+def content_fingerprint(contents: Iterable[str]) -> str:
+    """
+    Hash do conteúdo (texto, nota, tipo) de uma chave. Linhas que repetem
+    a chave entram juntas, na ordem, no mesmo fingerprint.
+    """
+    joined = "\x1e".join(contents)
+    return hashlib.blake2b(joined.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _fingerprints(frame: pd.DataFrame) -> pd.Series:
+    content = (
+        frame["text"]
+        + "\x1f" + frame["notes"]
+        + "\x1f" + frame["type"].astype(str)
+    )
+    # uma linha por chave (o caso comum): hash direto, sem groupby
+    fingerprints = pd.Series(
+        [content_fingerprint((c,)) for c in content.tolist()],
+        index=frame.index,
+        dtype=object,
+    )
+
+    repeated = frame["cache_key"].duplicated(keep=False)
+    if repeated.any():
+        fingerprints[repeated] = (
+            content[repeated]
+            .groupby(frame.loc[repeated, "cache_key"], sort=False)
+            .transform(content_fingerprint)
+        )
+
+    return fingerprints
+
+
+def select_quotes(
+    frame: pd.DataFrame,
+    title_ids: dict[str, int],
+    title_author_ids: dict[tuple[str, str], int],
+    cutoff_book_id: int,
+    stored_fingerprints: Callable[[list[str]], dict[str, str | None]],
+    committed_keys: set[str],
+) -> tuple[list[dict], dict[str, int]]:
+    """
+    Aplica as regras que dependem dos livros já resolvidos:
+    corte por CUTOFF_BOOK_ID, tipo 0, sem posição e conteúdo inalterado.
+
+    stored_fingerprints recebe as chaves candidatas e devolve as já
+    importadas → fingerprint guardado (IdempotencyStore). Chave com o
+    mesmo fingerprint, ou já commitada neste run (committed_keys, do
+    journal), é descartada sem acesso ao DB; as demais seguem marcadas
+    com known (chave já importada → só UPDATE) ou não.
+
+    Retorna (linhas planejadas para o merge, linhas descartadas por regra).
+    """
+    filtered: dict[str, int] = {}
+
+    frame = frame.assign(book_id=_book_ids(frame, title_ids, title_author_ids))
+
+    frame = _drop(frame, frame["book_id"] < cutoff_book_id, RULE_CUTOFF, filtered)
+    frame = _drop(frame, frame["type"].eq(0), RULE_TYPE_ZERO, filtered)
+    frame = _drop(frame, frame["location_start"].isna(), RULE_NO_LOCATION, filtered)
+
+    frame = frame.assign(
+        cache_key=(
+            frame["book_id"].astype(str)
+            + "|"
+            + frame["location_start"].astype(str)
+        )
+    )
+    frame = frame.assign(fingerprint=_fingerprints(frame))
+
+    stored = stored_fingerprints(frame["cache_key"].tolist())
+    frame = frame.assign(known=frame["cache_key"].isin(list(stored)).astype(int))
+
+    unchanged = (
+        frame["cache_key"].isin(list(committed_keys))
+        | frame["cache_key"].map(stored).eq(frame["fingerprint"])
+    )
+    frame = _drop(frame, unchanged, RULE_UNCHANGED, filtered)
+
+    planned = frame[_PLANNED_COLUMNS].astype(object)
+    planned = planned.where(planned.notna(), None)
+
+    return planned.to_dict("records"), filtered
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from app import app, db
+from importer.config import CUTOFF_BOOK_ID
+from importer.persistence.idempotency_store import (
+    QUOTES_NAMESPACE,
+    VOCABULARY_NAMESPACE,
+    IdempotencyStore,
+    quote_key,
+    vocabulary_key,
+)
+from importer.persistence.quote_rows import content_fingerprint, quote_content
+from models import Book, Quote, Vocabulary
+
+
+# linhas por fetch do cursor (server-side no Postgres)
+_STREAM_CHUNK_SIZE = 2000
+
+
+@dataclass(slots=True)
+class Drift:
+    namespace: str
+    in_db: int = 0
+    in_store: int = 0
+    missing: int = 0    # no DB, mas não no store (import refaria o trabalho)
+    stale: int = 0      # no store, mas removido do DB
+    filled: int = 0     # no store sem fingerprint (ex.: migrado do JSON)
+
+    def __str__(self) -> str:
+        return (
+            f"{self.namespace} | db: {self.in_db} | store: {self.in_store} | "
+            f"missing: {self.missing} | stale: {self.stale} | "
+            f"no fingerprint: {self.filled}"
+        )
+
+
+def _stream(stmt):
+    return db.session.execute(stmt.execution_options(yield_per=_STREAM_CHUNK_SIZE))
+
+
+def _db_quote_fingerprints() -> dict[str, str]:
+    """
+    Chave → fingerprint do conteúdo gravado, no mesmo formato do import
+    (select_quotes). Só livros a partir do cutoff, que é o que o import
+    consulta no store.
+    """
+    rows = _stream(
+        db.select(Quote.book_id, Quote.location_start, Quote.text, Quote.notes, Quote.type)
+        .where(
+            Quote.book_id >= CUTOFF_BOOK_ID,
+            Quote.location_start.isnot(None),
+        )
+        .order_by(Quote.book_id, Quote.location_start, Quote.id)
+    )
+
+    contents: dict[str, list[str]] = {}
+    for book_id, location_start, text, notes, quote_type in rows:
+        contents.setdefault(quote_key(book_id, location_start), []).append(
+            quote_content((text or "").strip(), (notes or "").strip(), quote_type)
+        )
+
+    return {key: content_fingerprint(parts) for key, parts in contents.items()}
+
+
+def _db_vocabulary_keys() -> set[str]:
+    rows = _stream(
+        db.select(Book.title, Vocabulary.location_start)
+        .join(Book, Book.id == Vocabulary.book_id)
+    )
+    return {vocabulary_key(title, location_start) for title, location_start in rows}
+
+
+def _reconcile_namespace(
+    store: IdempotencyStore,
+    namespace: str,
+    db_values: dict[str, str | None],
+    rebuild: bool,
+) -> Drift:
+    drift = Drift(namespace, in_db=len(db_values))
+
+    stale: list[str] = []
+    unfilled: list[tuple[str, str]] = []
+    seen: set[str] = set()
+
+    for key, value in store.items(namespace):
+        drift.in_store += 1
+        if key not in db_values:
+            stale.append(key)
+            continue
+
+        seen.add(key)
+        if value is None and db_values[key] is not None:
+            unfilled.append((key, db_values[key]))
+
+    missing = [(key, value) for key, value in db_values.items() if key not in seen]
+
+    drift.missing = len(missing)
+    drift.stale = len(stale)
+    drift.filled = len(unfilled)
+
+    if rebuild:
+        store.delete_many(namespace, stale)
+        store.set_many(namespace, missing + unfilled)
+
+    return drift
+
+
+def reconcile(store: IdempotencyStore | None = None, rebuild: bool = True) -> list[Drift]:
+    """
+    Compara o IdempotencyStore com as tabelas quotes / vocabulary e
+    reporta a divergência. Com rebuild, o store passa a espelhar o DB:
+    chaves ausentes entram (quotes com fingerprint), chaves removidas do
+    DB saem — e voltam a ser importadas se ainda estiverem no clippings.
+    """
+    own_store = store is None
+    store = store or IdempotencyStore()
+
+    with app.app_context():
+        quote_values = _db_quote_fingerprints()
+        vocabulary_values = dict.fromkeys(_db_vocabulary_keys())
+        db.session.rollback()
+
+    report = [
+        _reconcile_namespace(store, QUOTES_NAMESPACE, quote_values, rebuild),
+        _reconcile_namespace(store, VOCABULARY_NAMESPACE, vocabulary_values, rebuild),
+    ]
+
+    for drift in report:
+        print(f"🔎 Drift | {drift}")
+
+    if rebuild:
+        print(
+            f"🛠️ Store rebuilt | quotes: {store.count(QUOTES_NAMESPACE)} | "
+            f"vocabulary: {store.count(VOCABULARY_NAMESPACE)}"
+        )
+
+    if own_store:
+        store.close()
+
+    return report
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+from importer.config import JOURNAL_FILE
+
+
+QUOTES_STAGE = "quotes"
+VOCABULARY_STAGE = "vocabulary"
+
+
+class RunJournal:
+    """
+    Diário append-only (JSON Lines) dos lotes commitados em um run.
+
+    Linhas:
+        {"run": "<id>", "started_at": "..."}
+        {"stage": "quotes", "batch": 1, "keys": [...], "committed_at": "..."}
+        ...
+        {"finished": true, "finished_at": "..."}
+
+    Cada lote é gravado (com fsync) logo após o commit no DB. Um run que
+    falhou no meio deixa o diário sem "finished"; com --resume, o próximo
+    run pula as chaves já commitadas.
+    """
+
+    def __init__(self, path: Path = JOURNAL_FILE):
+        self.path = path
+        self.run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self._committed: dict[str, set[str]] = {}
+        self._batches: dict[str, int] = {}
+
+    @classmethod
+    def open(cls, resume: bool = False, path: Path = JOURNAL_FILE) -> "RunJournal":
+        journal = cls(path)
+
+        if resume and journal._load_unfinished():
+            total = sum(len(keys) for keys in journal._committed.values())
+            print(f"🔁 Resume | run {journal.run_id} | {total} chaves já commitadas")
+            return journal
+
+        if resume:
+            print("ℹ️ Resume | nenhum run interrompido — começando do zero.")
+
+        journal._start()
+        return journal
+
+    def _load_unfinished(self) -> bool:
+        if not self.path.exists():
+            return False
+
+        entries = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    # linha truncada por crash no meio da escrita
+                    continue
+
+        if not entries or "run" not in entries[0]:
+            return False
+
+        if any(e.get("finished") for e in entries):
+            return False
+
+        self.run_id = entries[0]["run"]
+        for e in entries[1:]:
+            stage = e.get("stage")
+            if stage is None:
+                continue
+            self._committed.setdefault(stage, set()).update(e.get("keys", []))
+            self._batches[stage] = max(self._batches.get(stage, 0), e.get("batch", 0))
+
+        return True
+
+    def _start(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({
+                "run": self.run_id,
+                "started_at": datetime.now().isoformat(timespec="seconds"),
+            }) + "\n")
+
+    def _append(self, entry: dict):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def committed(self, stage: str) -> set[str]:
+        return self._committed.get(stage, set())
+
+    def record_batch(self, stage: str, keys):
+        keys = sorted(keys)
+        batch = self._batches.get(stage, 0) + 1
+        self._batches[stage] = batch
+        self._committed.setdefault(stage, set()).update(keys)
+
+        self._append({
+            "stage": stage,
+            "batch": batch,
+            "keys": keys,
+            "committed_at": datetime.now().isoformat(timespec="seconds"),
+        })
+
+    def finish(self):
+        self._append({
+            "finished": True,
+            "finished_at": datetime.now().isoformat(timespec="seconds"),
+        })
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from importer.config import CHECKPOINT_FILE
+
+
+CHECKPOINT_VERSION = 3
+
+
+def _hash_span(input_file: Path, start: int, end: int) -> str:
+    with open(input_file, "rb") as f:
+        f.seek(start)
+        return hashlib.sha256(f.read(end - start)).hexdigest()
+
+
+def load_checkpoint(input_file: Path, path: Path = CHECKPOINT_FILE) -> dict | None:
+    """
+    Retorna o checkpoint salvo se o arquivo atual ainda começa com o mesmo
+    conteúdo (só recebeu blocos novos no final). Caso contrário None,
+    e o chamador faz o parse completo.
+
+    Estrutura:
+        {
+            "version": 3,
+            "source": "<caminho do My Clippings.txt>",
+            "offset": <byte após o último bloco processado>,
+            "last_block_start": <byte inicial do último bloco>,
+            "last_block_sha256": "...",
+            "state": {...}   # metadados + spans (ClippingsState.to_dict)
+        }
+    """
+    if not path.exists():
+        return None
+
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        print("⚠️ Checkpoint corrompido — parse completo.")
+        return None
+
+    if data.get("version") != CHECKPOINT_VERSION:
+        return None
+
+    if data.get("source") != str(input_file.resolve()):
+        return None
+
+    offset = int(data.get("offset", 0))
+    last_start = int(data.get("last_block_start", 0))
+
+    if not input_file.exists() or input_file.stat().st_size < offset:
+        print("⚠️ My Clippings.txt encolheu — parse completo.")
+        return None
+
+    if _hash_span(input_file, last_start, offset) != data.get("last_block_sha256"):
+        print("⚠️ My Clippings.txt foi substituído — parse completo.")
+        return None
+
+    return data
+
+
+def save_checkpoint(
+    input_file: Path,
+    state: dict,
+    last_block_start: int,
+    offset: int,
+    path: Path = CHECKPOINT_FILE,
+):
+    """
+    Persiste o checkpoint de forma atômica (tmp + replace).
+    """
+    data = {
+        "version": CHECKPOINT_VERSION,
+        "source": str(input_file.resolve()),
+        "offset": offset,
+        "last_block_start": last_block_start,
+        "last_block_sha256": _hash_span(input_file, last_block_start, offset),
+        "state": state,
+    }
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(
+        json.dumps(data, ensure_ascii=False, separators=(",", ":")),
+        encoding="utf-8",
+    )
+    os.replace(tmp, path)
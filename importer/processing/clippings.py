@@ -1,41 +1,48 @@
 from __future__ import annotations
 
-import re
+import mmap
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
 from pathlib import Path
-from openpyxl import Workbook
 
 from importer.processing.highlight_validation import (
     is_valid_highlight,
     is_fragment_quote,
 )
-from importer.processing.notes import get_type_and_note, extract_rating_from_note
-from importer.config import INPUT_FILE, EXCEL_FILE
+from importer.processing.notes import extract_rating_from_note, get_type_and_note
+from importer.processing.clippings_parser import (
+    BLOCK_SEPARATOR,
+    Clipping,
+    block_content,
+    iter_block_spans,
+    parse_block,
+    read_block,
+)
+from importer.processing.records import Highlight, Note, intern_str
+from importer.processing.checkpoint import load_checkpoint, save_checkpoint
+from importer.processing.excel_report import ExcelReport
+from importer.processing.vocabulary_matcher import VocabularyMatcher
+from importer.config import (
+    INPUT_FILE,
+    CHECKPOINT_FILE,
+    PROCESS_WORKERS,
+)
 
 VOCABULARY_TYPE = 99  # 🔤 Vocabulary
 
-
-def _parse_added_at(meta_info: str) -> str:
-    m = re.search(r"Added on (.+)$", meta_info)
-    return m.group(1).strip() if m else ""
+_vocabulary_matcher = VocabularyMatcher()
 
 
 def _ranges_overlap(a_start: int, a_end: int, b_start: int, b_end: int) -> bool:
     return a_start <= b_end and b_start <= a_end
 
 
-def _word_in_text(word: str, text: str) -> bool:
-    if not word or not text:
-        return False
-
-    pattern = rf"\b{re.escape(word.lower())}\b"
-    return re.search(pattern, text.lower()) is not None
-
-
-def _choose_best_highlight(cluster: list[dict]) -> dict | None:
+def _choose_best_highlight(cluster: list[Highlight]) -> Highlight | None:
     if not cluster:
         return None
 
-    non_frag = [h for h in cluster if not is_fragment_quote(h.get("quote", ""))]
+    non_frag = [h for h in cluster if not is_fragment_quote(h.quote)]
     candidates = non_frag if non_frag else cluster
 
     best = None
@@ -45,10 +52,10 @@ def _choose_best_highlight(cluster: list[dict]) -> dict | None:
             continue
 
         if (
-            h.get("added_at", "") > best.get("added_at", "")
+            h.added_at > best.added_at
             or (
-                h.get("added_at", "") == best.get("added_at", "")
-                and len(h.get("quote", "")) > len(best.get("quote", ""))
+                h.added_at == best.added_at
+                and len(h.quote) > len(best.quote)
             )
         ):
             best = h
@@ -56,332 +63,566 @@ def _choose_best_highlight(cluster: list[dict]) -> dict | None:
     return best
 
 
-def _dedupe_highlights_by_overlap_safe(highlights_list: list[dict]) -> list[dict]:
-    items = sorted(
-        highlights_list,
-        key=lambda x: (x.get("location_start", 0), x.get("location_end", 0)),
-    )
-
-    clusters: list[list[dict]] = []
+class _MaxEndTree:
+    """
+    Árvore de segmentos de máximo sobre posições fixas (clusters em ordem
+    de criação, highlights em ordem de location_start). Responde
+    "primeira posição >= lo com valor >= x" em O(log n).
+    """
+
+    def __init__(self, capacity: int):
+        size = 1
+        while size < max(capacity, 1):
+            size *= 2
+        self._size = size
+        self._tree = [float("-inf")] * (2 * size)
+
+    def raise_to(self, idx: int, value: int):
+        pos = idx + self._size
+        if self._tree[pos] >= value:
+            return
+
+        self._tree[pos] = value
+        pos //= 2
+        while pos and self._tree[pos] < value:
+            self._tree[pos] = value
+            pos //= 2
+
+    def first_at_least(self, value: int, lo: int = 0) -> int | None:
+        return self._first_at_least(1, 0, self._size, value, lo)
+
+    def _first_at_least(
+        self,
+        node: int,
+        node_lo: int,
+        node_hi: int,
+        value: int,
+        lo: int,
+    ) -> int | None:
+        if node_hi <= lo or self._tree[node] < value:
+            return None
+
+        if node >= self._size:
+            return node_lo
+
+        mid = (node_lo + node_hi) // 2
+        found = self._first_at_least(2 * node, node_lo, mid, value, lo)
+        if found is not None:
+            return found
+        return self._first_at_least(2 * node + 1, mid, node_hi, value, lo)
+
+
+def _cluster_by_overlap(items: list[Highlight]) -> list[list[Highlight]]:
+    """
+    Sweep-line sobre highlights ordenados por (location_start, location_end).
+
+    Mesmo agrupamento do first-fit original: cada highlight entra no
+    primeiro cluster (ordem de criação) com algum membro sobreposto.
+    Como todo membro já visto tem start <= h.start, sobrepor algum membro
+    equivale a max_end(cluster) >= h.start.
+    """
+    clusters: list[list[Highlight]] = []
+    index = _MaxEndTree(len(items))
 
     for h in items:
-        placed = False
-        for cluster in clusters:
-            if any(
-                _ranges_overlap(
-                    h.get("location_start", 0),
-                    h.get("location_end", 0),
-                    c.get("location_start", 0),
-                    c.get("location_end", 0),
-                )
-                for c in cluster
-            ):
-                cluster.append(h)
-                placed = True
-                break
+        h_start = h.location_start
+        h_end = h.location_end
 
-        if not placed:
+        if h_end >= h_start:
+            target = index.first_at_least(h_start)
+        else:
+            # intervalo invertido: a equivalência acima não vale, varre
+            target = next(
+                (
+                    i for i, cluster in enumerate(clusters)
+                    if any(
+                        _ranges_overlap(
+                            h_start,
+                            h_end,
+                            c.location_start,
+                            c.location_end,
+                        )
+                        for c in cluster
+                    )
+                ),
+                None,
+            )
+
+        if target is None:
+            target = len(clusters)
             clusters.append([h])
+        else:
+            clusters[target].append(h)
+
+        index.raise_to(target, h_end)
+
+    return clusters
+
+
+def _dedupe_highlights_by_overlap_safe(
+    highlights_list: list[Highlight],
+) -> list[Highlight]:
+    items = sorted(
+        highlights_list,
+        key=lambda x: (x.location_start, x.location_end),
+    )
+
+    clusters = _cluster_by_overlap(items)
 
     final = []
     for cluster in clusters:
         best = _choose_best_highlight(cluster)
         if best is not None:
-            merged_notes: list[dict] = []
+            merged_notes: list[Note] = []
             for item in cluster:
-                merged_notes.extend(item.get("notes", []) or [])
+                merged_notes.extend(item.notes)
             if merged_notes:
-                best = dict(best)
-                best["notes"] = merged_notes
+                best = replace(best, notes=merged_notes)
             final.append(best)
 
-    final.sort(key=lambda x: (x.get("location_start", 0), x.get("location_end", 0)))
+    final.sort(key=lambda x: (x.location_start, x.location_end))
     return final
 
 
-def _choose_best_note(notes: list[dict]) -> dict | None:
-    valid: list[dict] = []
-
-    for n in notes:
-        if not isinstance(n, dict):
-            continue
-
-        note_type = n.get("type", 0)
-        if note_type == 0:
-            continue
-
-        note_text = (n.get("note") or "").strip()
-        added_at = n.get("added_at", "")
-
-        valid.append({
-            "type": note_type,
-            "note": note_text,
-            "added_at": n.get("added_at", ""),
-            "_has_text": bool(note_text),
-        })
-
+def _choose_best_note(notes: list[Note]) -> Note | None:
+    valid = [n for n in notes if n.type != 0]
     if not valid:
         return None
 
-    valid.sort(
+    return max(
+        valid,
         key=lambda n: (
-            n["added_at"],  # ⏰ MAIS RECENTE VENCE
-            n["_has_text"],
-            len(n["note"]),
+            n.added_at,  # ⏰ MAIS RECENTE VENCE
+            bool(n.note.strip()),
+            len(n.note.strip()),
         ),
-        reverse=True
     )
 
-    best = valid[0]
-    return {"type": best["type"], "note": best["note"]}
-
 
 def _note_loc_compatible(note_loc: int, h_start: int, h_end: int) -> bool:
     return (h_start - 2) <= note_loc <= (h_end + 2)
 
 
-def _find_best_highlight_for_orphan(
-    highlights: list[dict],
-    book_title: str,
-    author: str,
-    note_loc: int,
-) -> dict | None:
-    candidates: list[tuple[int, int, int, dict]] = []
+def _orphan_rank(h: Highlight, note_loc: int) -> tuple[int, int, int] | None:
+    h_start = h.location_start
+    h_end = h.location_end
 
-    for h in highlights:
-        if h.get("book") != book_title or h.get("author") != author:
-            continue
-
-        h_start = int(h.get("location_start", 0) or 0)
-        h_end = int(h.get("location_end", 0) or 0)
+    if h_start <= note_loc <= h_end:
+        pri, dist = 0, 0
+    elif note_loc == h_start:
+        pri, dist = 1, 0
+    else:
+        pri = 2
+        dist = min(abs(note_loc - h_start), abs(note_loc - h_end))
 
-        if h_start <= note_loc <= h_end:
-            pri, dist = 0, 0
-        elif note_loc == h_start:
-            pri, dist = 1, 0
-        else:
-            pri = 2
-            dist = min(abs(note_loc - h_start), abs(note_loc - h_end))
-
-        if dist <= 3:
-            seq = int(h.get("_seq", 0) or 0)
-            candidates.append((pri, dist, -seq, h))
-
-    if not candidates:
+    if dist > 3:
         return None
 
-    candidates.sort(key=lambda t: (t[0], t[1], t[2]))
-    return candidates[0][3]
-
-
-def process_clippings(
-    input_file: Path = INPUT_FILE,
-    output_excel: Path = EXCEL_FILE,
-):
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Valid Quotes"
-
-    ws.append([
-        "Page", "Type", "Quote", "Author", "Book", "Note",
-        "LocationStart", "LocationEnd",
-    ])
-
-    raw_data = input_file.read_text(encoding="utf-8")
-    blocks = [b.strip() for b in raw_data.split("==========") if b.strip()]
+    return pri, dist, -h.seq
+
+
+class _BookHighlightIndex:
+    """
+    Highlights de um (book, author) indexados por location_start,
+    location_end e _seq, para anexar notas órfãs via bisect.
+    """
+
+    def __init__(self, highlights: list[Highlight]):
+        self._by_start = sorted(highlights, key=lambda h: h.location_start)
+        self._starts = [h.location_start for h in self._by_start]
+
+        self._by_end = sorted(highlights, key=lambda h: h.location_end)
+        self._ends = [h.location_end for h in self._by_end]
+
+        self._ends_tree = _MaxEndTree(len(self._by_start))
+        for i, h in enumerate(self._by_start):
+            self._ends_tree.raise_to(i, h.location_end)
+
+        # highlights_by_book_author já está em ordem de seq
+        self._by_seq = highlights
+        self._seqs = [h.seq for h in highlights]
+
+    def _candidates(self, note_loc: int):
+        # start ou end a até 3 posições da nota
+        lo = bisect_left(self._starts, note_loc - 3)
+        hi = bisect_right(self._starts, note_loc + 3)
+        yield from self._by_start[lo:hi]
+
+        lo = bisect_left(self._ends, note_loc - 3)
+        hi = bisect_right(self._ends, note_loc + 3)
+        yield from self._by_end[lo:hi]
+
+        # highlights que contêm a nota (start <= loc <= end)
+        limit = bisect_right(self._starts, note_loc)
+        idx = self._ends_tree.first_at_least(note_loc)
+        while idx is not None and idx < limit:
+            yield self._by_start[idx]
+            idx = self._ends_tree.first_at_least(note_loc, idx + 1)
+
+    def best_for_orphan(self, note_loc: int) -> Highlight | None:
+        best = None
+        best_rank = None
+
+        for h in self._candidates(note_loc):
+            rank = _orphan_rank(h, note_loc)
+            if rank is not None and (best_rank is None or rank < best_rank):
+                best, best_rank = h, rank
+
+        return best
+
+    def next_after_seq(self, seq: int) -> Highlight | None:
+        idx = bisect_right(self._seqs, seq)
+        return self._by_seq[idx] if idx < len(self._by_seq) else None
+
+
+class ClippingsState:
+    """
+    Estado acumulado do parse (antes da finalização), serializável
+    no checkpoint para permitir o parse incremental.
+
+    O checkpoint guarda só metadados e o span (início, fim) de cada
+    bloco no arquivo; os textos são relidos do próprio My Clippings.txt
+    (via mmap) ao restaurar.
+    """
+
+    def __init__(self):
+        self.highlights_by_book_author: dict[tuple[str, str], list[Highlight]] = {}
+        self.all_highlights_in_order: list[Highlight] = []
+        self.last_highlight_by_book_author: dict[tuple[str, str], Highlight] = {}
+        self.orphan_notes: list[Note] = []
+        self.seq = 0
+        self.spans: dict[int, tuple[int, int]] = {}
+
+    def add(self, clipping: Clipping, span: tuple[int, int]):
+        key = (clipping.book, clipping.author)
+        clipping.seq = self.seq
+        self.spans[self.seq] = span
+        self.seq += 1
+
+        if isinstance(clipping, Highlight):
+            self.highlights_by_book_author.setdefault(key, []).append(clipping)
+            self.all_highlights_in_order.append(clipping)
+            self.last_highlight_by_book_author[key] = clipping
+            return
+
+        last_h = self.last_highlight_by_book_author.get(key)
+
+        if last_h is not None and _note_loc_compatible(
+            clipping.location,
+            last_h.location_start,
+            last_h.location_end,
+        ):
+            last_h.notes.append(clipping)
+        else:
+            self.orphan_notes.append(clipping)
+
+    def to_dict(self) -> dict:
+        """
+        Formato compacto (linhas posicionais, sem texto):
+            books:      [[book, author], ...]
+            highlights: [[book, page, start, end, added_at, seq, span_start, span_end], ...]
+            notes:      [[book, page, location, added_at, type, seq, span_start, span_end, highlight], ...]
+                        (highlight = índice do highlight dono, -1 = órfã)
+        """
+        books: dict[tuple[str, str], int] = {}
+
+        def book_idx(c: Clipping) -> int:
+            return books.setdefault((c.book, c.author), len(books))
+
+        def note_row(n: Note, owner: int) -> list:
+            return [
+                book_idx(n), n.page, n.location, n.added_at, n.type, n.seq,
+                *self.spans[n.seq], owner,
+            ]
+
+        highlights = []
+        notes = []
+        index_by_seq = {}
+
+        for i, h in enumerate(self.all_highlights_in_order):
+            index_by_seq[h.seq] = i
+            highlights.append([
+                book_idx(h), h.page, h.location_start, h.location_end,
+                h.added_at, h.seq, *self.spans[h.seq],
+            ])
+            notes.extend(note_row(n, i) for n in h.notes)
+
+        notes.extend(note_row(n, -1) for n in self.orphan_notes)
+
+        return {
+            "seq": self.seq,
+            "books": [list(key) for key in books],
+            "highlights": highlights,
+            "notes": notes,
+            "last_highlight": [
+                [books[key], index_by_seq[h.seq]]
+                for key, h in self.last_highlight_by_book_author.items()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict, input_file: Path) -> "ClippingsState":
+        state = cls()
+        state.seq = data["seq"]
+        books = [(intern_str(b), intern_str(a)) for b, a in data["books"]]
+
+        with open(input_file, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mm:
+            for b, page, start, end, added_at, seq, s0, s1 in data["highlights"]:
+                book, author = books[b]
+                h = Highlight(
+                    book=book,
+                    author=author,
+                    page=page,
+                    location_start=start,
+                    location_end=end,
+                    added_at=added_at,
+                    quote=block_content(read_block(mm, s0, s1)),
+                    seq=seq,
+                )
+                state.spans[seq] = (s0, s1)
+                state.highlights_by_book_author.setdefault(books[b], []).append(h)
+                state.all_highlights_in_order.append(h)
+
+            for b, page, location, added_at, note_type, seq, s0, s1, owner in data["notes"]:
+                book, author = books[b]
+                _, note_text = get_type_and_note(block_content(read_block(mm, s0, s1)))
+                n = Note(
+                    book=book,
+                    author=author,
+                    page=page,
+                    location=location,
+                    added_at=added_at,
+                    type=note_type,
+                    note=note_text,
+                    seq=seq,
+                )
+                state.spans[seq] = (s0, s1)
 
-    highlights_by_book_author: dict[tuple[str, str], list[dict]] = {}
-    all_highlights_in_order: list[dict] = []
-    last_highlight_by_book_author: dict[tuple[str, str], dict] = {}
+                if owner >= 0:
+                    state.all_highlights_in_order[owner].notes.append(n)
+                else:
+                    state.orphan_notes.append(n)
 
-    orphan_notes: list[dict] = []
-    ratings_detected: list[dict] = []
-    vocabularies_detected: list[dict] = []
+        for b, idx in data["last_highlight"]:
+            state.last_highlight_by_book_author[books[b]] = (
+                state.all_highlights_in_order[idx]
+            )
 
-    seq = 0
+        return state
+
+
+def _is_terminated(input_file: Path, end: int) -> bool:
+    size = len(BLOCK_SEPARATOR)
+    with open(input_file, "rb") as f:
+        f.seek(max(end - size, 0))
+        return f.read(size) == BLOCK_SEPARATOR
+
+
+def _scan_clippings(
+    input_file: Path,
+    checkpoint_file: Path | None,
+) -> tuple[ClippingsState, dict | None]:
+    """
+    Lê apenas os blocos novos desde o último checkpoint (ou o arquivo todo).
+    Retorna o estado e o payload de checkpoint a salvar (None = nada a salvar).
+    """
+    state = None
+    offset = 0
+    last_block_start = None
+
+    if checkpoint_file is not None:
+        checkpoint = load_checkpoint(input_file, checkpoint_file)
+        if checkpoint is not None:
+            state = ClippingsState.from_dict(checkpoint["state"], input_file)
+            offset = checkpoint["offset"]
+            last_block_start = checkpoint["last_block_start"]
+            print(f"📌 Checkpoint encontrado — lendo a partir do byte {offset}")
+
+    if state is None:
+        state = ClippingsState()
+
+    new_blocks = 0
+    snapshot = None
+    restored_offset = offset
+    file_size = input_file.stat().st_size
+
+    for start, end, block in iter_block_spans(input_file, offset):
+        new_blocks += 1
+
+        if end == file_size and not _is_terminated(input_file, end):
+            # bloco final ainda sem "==========": entra no resultado,
+            # mas não no checkpoint (pode crescer na próxima gravação)
+            if last_block_start is not None:
+                snapshot = state.to_dict()
+        else:
+            last_block_start, offset = start, end
 
-    for block in blocks:
-        lines = [line.strip() for line in block.split("\n") if line.strip()]
-        if len(lines) < 2:
-            continue
+        clipping = parse_block(block)
+        if clipping is not None:
+            state.add(clipping, (start, end))
 
-        book_info = lines[0]
-        if "(" in book_info and ")" in book_info:
-            book_title = book_info.split("(")[0].strip()
-            author = book_info.split("(")[-1].replace(")", "").strip()
-        else:
-            book_title = book_info.strip()
-            author = "Unknown"
-
-        meta_info = lines[1]
-        meta_lower = meta_info.lower()
-        added_at = _parse_added_at(meta_info)
-
-        page = None
-        if "page" in meta_lower:
-            parts = [p for p in meta_info.split("|") if "page" in p.lower()]
-            if parts:
-                try:
-                    page = int(parts[0].split()[-1])
-                except ValueError:
-                    page = None
-
-        loc_match = re.search(r"location\s+(\d+)(?:-(\d+))?", meta_lower)
-        if not loc_match:
-            continue
+    print(f"📖 Blocos novos lidos: {new_blocks}")
 
-        loc_start = int(loc_match.group(1))
-        loc_end = int(loc_match.group(2)) if loc_match.group(2) else loc_start
+    # nenhum bloco completo novo: o checkpoint salvo continua valendo
+    if checkpoint_file is None or last_block_start is None or offset == restored_offset:
+        return state, None
 
-        content = "\n".join(lines[2:]).strip()
+    return state, {
+        "state": snapshot if snapshot is not None else state.to_dict(),
+        "last_block_start": last_block_start,
+        "offset": offset,
+    }
 
-        if content.startswith("<You have reached") or "<You have reached" in content:
-            continue
 
-        if "highlight" in meta_lower and content.lower().startswith("nota"):
-            continue
+def _finalize_book(
+    shard: tuple[list[Highlight], list[Note]],
+) -> tuple[list[dict], list[dict], list[dict]]:
+    """
+    Finaliza um (book, author): anexa notas órfãs, deduplica e classifica
+    em quotes, ratings e vocabulary. Não depende de outros livros,
+    então roda tanto no processo principal quanto num worker.
+    """
+    highlights, orphan_notes = shard
 
-        key = (book_title, author)
-
-        if "highlight" in meta_lower:
-            h = {
-                "page": page,
-                "quote": content,
-                "author": author,
-                "book": book_title,
-                "location_start": loc_start,
-                "location_end": loc_end,
-                "added_at": added_at,
-                "notes": [],
-                "_seq": seq,
-            }
-            seq += 1
-            highlights_by_book_author.setdefault(key, []).append(h)
-            all_highlights_in_order.append(h)
-            last_highlight_by_book_author[key] = h
-
-        elif "note" in meta_lower:
-            note_type, note_text = get_type_and_note(content)
-            if note_type == 0:
-                continue
+    quotes: list[dict] = []
+    ratings: list[dict] = []
+    vocab_candidates: list[dict] = []
 
-            note_obj = {
-                "type": note_type,
-                "note": note_text,
-                "location": loc_start,
-                "book": book_title,
-                "author": author,
-                "added_at": added_at,
-                "_seq": seq,
-            }
-            seq += 1
-
-            last_h = last_highlight_by_book_author.get(key)
-
-            if last_h is not None and _note_loc_compatible(
-                loc_start,
-                last_h["location_start"],
-                last_h["location_end"],
-            ):
-                last_h["notes"].append({
-                    "type": note_type,
-                    "note": note_text,
-                    "added_at": added_at,
-                })
-            else:
-                orphan_notes.append(note_obj)
+    index = _BookHighlightIndex(highlights)
 
-    attached_ids = set()
+    unattached: list[Note] = []
     for n in orphan_notes:
-        target = _find_best_highlight_for_orphan(
-            highlights=all_highlights_in_order,
-            book_title=n["book"],
-            author=n["author"],
-            note_loc=n["location"],
-        )
+        target = index.best_for_orphan(n.location)
         if target is not None:
-            target["notes"].append({
-                "type": n["type"],
-                "note": n["note"],
-                "added_at": n["added_at"],
-            })
-            attached_ids.add(id(n))
-
-    for n in orphan_notes:
-        if id(n) in attached_ids:
-            continue
-
-        for h in all_highlights_in_order:
-            if (
-                h["book"] == n["book"]
-                and h["author"] == n["author"]
-                and h["_seq"] > n["_seq"]
-            ):
-                h["notes"].append({
-                    "type": n["type"],
-                    "note": n["note"],
-                    "added_at": n["added_at"],
-                })
-                break
+            target.notes.append(n)
+        else:
+            unattached.append(n)
 
-    final_highlights: list[dict] = []
-    for hs in highlights_by_book_author.values():
-        final_highlights.extend(_dedupe_highlights_by_overlap_safe(hs))
+    for n in unattached:
+        target = index.next_after_seq(n.seq)
+        if target is not None:
+            target.notes.append(n)
 
-    for h in final_highlights:
+    for h in _dedupe_highlights_by_overlap_safe(highlights):
         final_type = 0
         final_note = ""
 
-        best_note = _choose_best_note(h.get("notes", []) or [])
+        best_note = _choose_best_note(h.notes)
         if best_note:
-            final_type = best_note["type"]
-            final_note = best_note["note"]
+            final_type = best_note.type
+            final_note = best_note.note.strip()
 
-        if (final_note or "").lower().startswith("nota"):
+        if final_note.lower().startswith("nota"):
             rating = extract_rating_from_note(final_note)
             if rating is not None:
-                ratings_detected.append({
-                    "book": h["book"],
-                    "author": h["author"],
+                ratings.append({
+                    "book": h.book,
+                    "author": h.author,
                     "rating": rating,
                 })
             continue
 
-        if not is_valid_highlight(h.get("quote", ""), final_type):
+        if not is_valid_highlight(h.quote, final_type):
             continue
 
+        quote_text = h.quote.strip()
+
         if final_type == VOCABULARY_TYPE:
-            word = (final_note or "").strip()
-            quote_text = (h.get("quote") or "").strip()
+            word = final_note
 
             if not word:
                 continue
 
-            if not _word_in_text(word, quote_text):
-                continue
-
-            vocabularies_detected.append({
-                "book": h["book"],
-                "author": h["author"],
-                "location_start": h["location_start"],
-                "location_end": h["location_end"],
+            vocab_candidates.append({
+                "book": h.book,
+                "author": h.author,
+                "location_start": h.location_start,
+                "location_end": h.location_end,
                 "word": word,
                 "text": quote_text,
-                "page": h.get("page"),
+                "page": h.page,
             })
             continue
 
-        ws.append([
-            h.get("page"),
-            final_type,
-            (h.get("quote") or "").strip(),
-            h.get("author") or "",
-            h.get("book") or "",
-            (final_note or "").strip(),
-            h.get("location_start") or 0,
-            h.get("location_end") or 0,
-        ])
+        quotes.append({
+            "book": h.book,
+            "author": h.author,
+            "page": h.page,
+            "type": final_type,
+            "quote": quote_text,
+            "note": final_note,
+            "location_start": h.location_start,
+            "location_end": h.location_end,
+        })
+
+    # 🔤 termo precisa aparecer no trecho — todos os candidatos do livro de uma vez
+    found = _vocabulary_matcher.match_all(
+        [(v["word"], v["text"]) for v in vocab_candidates]
+    )
+    vocab = [v for v, ok in zip(vocab_candidates, found) if ok]
+
+    return quotes, ratings, vocab
+
+
+def _iter_finalized_books(
+    shards: list[tuple[list[Highlight], list[Note]]],
+    workers: int,
+):
+    # executor.map preserva a ordem dos shards → saída idêntica ao serial
+    if workers <= 1 or len(shards) <= 1:
+        yield from map(_finalize_book, shards)
+        return
+
+    chunksize = max(1, len(shards) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_finalize_book, shards, chunksize=chunksize)
+
+
+def process_clippings(
+    input_file: Path = INPUT_FILE,
+    output_excel: Path | None = None,
+    checkpoint_file: Path | None = CHECKPOINT_FILE,
+    workers: int = PROCESS_WORKERS,
+):
+    """
+    Retorna (quotes, ratings, vocabularies) como listas de dicts.
+    O Excel só é gerado quando output_excel é informado (artefato opcional).
+    """
+    report = ExcelReport(output_excel) if output_excel is not None else None
+
+    state, checkpoint = _scan_clippings(input_file, checkpoint_file)
+
+    quotes_detected: list[dict] = []
+    ratings_detected: list[dict] = []
+    vocabularies_detected: list[dict] = []
+
+    # órfãs sem highlight do mesmo (book, author) nunca são anexadas
+    orphans_by_book_author: dict[tuple[str, str], list[Note]] = {}
+    for n in state.orphan_notes:
+        orphans_by_book_author.setdefault((n.book, n.author), []).append(n)
+
+    shards = [
+        (hs, orphans_by_book_author.get(key, []))
+        for key, hs in state.highlights_by_book_author.items()
+    ]
+
+    for quotes, ratings, vocab in _iter_finalized_books(shards, workers):
+        quotes_detected.extend(quotes)
+        ratings_detected.extend(ratings)
+        vocabularies_detected.extend(vocab)
+
+        if report is not None:
+            report.add_quotes(quotes)
+            report.add_ratings(ratings)
+            report.add_vocabulary(vocab)
+
+    if report is not None:
+        report.save()
 
-    wb.save(output_excel)
+    # ✅ só salva o checkpoint depois de um processamento completo
+    if checkpoint is not None:
+        save_checkpoint(input_file=input_file, path=checkpoint_file, **checkpoint)
 
-    return ratings_detected, vocabularies_detected
+    return quotes_detected, ratings_detected, vocabularies_detected
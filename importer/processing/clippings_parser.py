@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import mmap
+from pathlib import Path
+from typing import Iterator, Union
+
+from importer.processing.notes import get_type_and_note
+from importer.processing.metadata import KIND_HIGHLIGHT, KIND_NOTE, parse_meta
+from importer.processing.records import Highlight, Note, intern_str
+
+
+BLOCK_SEPARATOR = b"=========="
+
+# "limite de recortes" do Kindle (en / pt / es)
+CLIPPING_LIMIT_MARKERS = (
+    "<You have reached",
+    "<Você atingiu",
+    "<Has alcanzado",
+)
+
+Clipping = Union[Highlight, Note]
+
+
+def _decode_block(raw: bytes) -> str:
+    # Mesmo resultado do read_text() (newlines universais)
+    return raw.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n").strip()
+
+
+def iter_block_spans(
+    input_file: Path,
+    start_offset: int = 0,
+) -> Iterator[tuple[int, int, str]]:
+    """
+    Lê o My Clippings.txt via mmap a partir de start_offset e devolve
+    (início, fim, bloco) por vez, sem carregar o arquivo inteiro como str.
+    O fim inclui o separador "==========".
+    """
+    with open(input_file, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # arquivo vazio não pode ser mapeado
+            return
+
+        with mm:
+            start = start_offset
+            while start < len(mm):
+                end = mm.find(BLOCK_SEPARATOR, start)
+                if end == -1:
+                    raw = mm[start:]
+                    stop = len(mm)
+                else:
+                    raw = mm[start:end]
+                    stop = end + len(BLOCK_SEPARATOR)
+
+                block = _decode_block(raw)
+                if block:
+                    yield start, stop, block
+
+                start = stop
+
+
+def read_block(mm: mmap.mmap, start: int, stop: int) -> str:
+    """
+    Bloco de um span devolvido por iter_block_spans (com ou sem o
+    separador no fim).
+    """
+    raw = mm[start:stop]
+    if raw.endswith(BLOCK_SEPARATOR):
+        raw = raw[:-len(BLOCK_SEPARATOR)]
+    return _decode_block(raw)
+
+
+def _block_lines(block: str) -> list[str]:
+    return [line.strip() for line in block.split("\n") if line.strip()]
+
+
+def block_content(block: str) -> str:
+    """
+    Texto do recorte (tudo depois da linha de metadados), como em
+    parse_block.
+    """
+    return "\n".join(_block_lines(block)[2:]).strip()
+
+
+def iter_blocks(input_file: Path, start_offset: int = 0) -> Iterator[str]:
+    for _, _, block in iter_block_spans(input_file, start_offset):
+        yield block
+
+
+def parse_block(block: str) -> Clipping | None:
+    """
+    Converte um bloco em Highlight / Note.
+    Retorna None para blocos ignorados (bookmarks, limite de clipping, etc.).
+    """
+    lines = _block_lines(block)
+    if len(lines) < 2:
+        return None
+
+    book_info = lines[0]
+    if "(" in book_info and ")" in book_info:
+        book_title = book_info.split("(")[0].strip()
+        author = book_info.split("(")[-1].replace(")", "").strip()
+    else:
+        book_title = book_info.strip()
+        author = "Unknown"
+
+    book_title = intern_str(book_title)
+    author = intern_str(author)
+
+    meta = parse_meta(lines[1])
+    if meta is None:
+        return None
+
+    content = "\n".join(lines[2:]).strip()
+
+    if any(marker in content for marker in CLIPPING_LIMIT_MARKERS):
+        return None
+
+    if meta.kind == KIND_HIGHLIGHT:
+        if content.lower().startswith("nota"):
+            return None
+
+        return Highlight(
+            book=book_title,
+            author=author,
+            page=meta.page,
+            location_start=meta.location_start,
+            location_end=meta.location_end,
+            added_at=meta.added_at,
+            quote=content,
+        )
+
+    if meta.kind == KIND_NOTE:
+        note_type, note_text = get_type_and_note(content)
+        if note_type == 0:
+            return None
+
+        return Note(
+            book=book_title,
+            author=author,
+            page=meta.page,
+            location=meta.location_start,
+            added_at=meta.added_at,
+            type=note_type,
+            note=note_text,
+        )
+
+    return None
+
+
+def iter_clippings(input_file: Path) -> Iterator[Clipping]:
+    """
+    API de parsing isolada (sem Excel / DB): um registro por bloco válido,
+    na ordem do arquivo.
+    """
+    for block in iter_blocks(input_file):
+        clipping = parse_block(block)
+        if clipping is not None:
+            yield clipping
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from openpyxl import Workbook
+
+
+QUOTE_HEADER = [
+    "Page", "Type", "Quote", "Author", "Book", "Note",
+    "LocationStart", "LocationEnd",
+]
+RATING_HEADER = ["Book", "Author", "Rating"]
+VOCABULARY_HEADER = [
+    "Page", "Word", "Text", "Author", "Book",
+    "LocationStart", "LocationEnd",
+]
+
+
+class ExcelReport:
+    """
+    quotes.xlsx em modo write-only: as linhas vão direto para o arquivo
+    temporário de cada aba conforme os livros são finalizados, sem manter
+    a planilha inteira em memória.
+
+    "Valid Quotes" continua sendo a primeira aba (lida por import_from_excel).
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._wb = Workbook(write_only=True)
+
+        self._quotes = self._wb.create_sheet("Valid Quotes")
+        self._quotes.append(QUOTE_HEADER)
+
+        self._ratings = self._wb.create_sheet("Ratings")
+        self._ratings.append(RATING_HEADER)
+
+        self._vocabulary = self._wb.create_sheet("Vocabulary")
+        self._vocabulary.append(VOCABULARY_HEADER)
+
+    def add_quotes(self, quotes: list[dict]):
+        for q in quotes:
+            self._quotes.append([
+                q["page"],
+                q["type"],
+                q["quote"],
+                q["author"] or "",
+                q["book"] or "",
+                q["note"],
+                q["location_start"] or 0,
+                q["location_end"] or 0,
+            ])
+
+    def add_ratings(self, ratings: list[dict]):
+        for r in ratings:
+            self._ratings.append([r["book"], r["author"], r["rating"]])
+
+    def add_vocabulary(self, vocabularies: list[dict]):
+        for v in vocabularies:
+            self._vocabulary.append([
+                v["page"],
+                v["word"],
+                v["text"],
+                v["author"] or "",
+                v["book"] or "",
+                v["location_start"] or 0,
+                v["location_end"] or 0,
+            ])
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._wb.save(self.path)
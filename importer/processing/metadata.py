@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import calendar
+import re
+from dataclasses import dataclass
+
+
+# -------------------------------
+# Idiomas do Kindle
+# -------------------------------
+# Cada entrada lista fragmentos de regex (já em minúsculas) da linha de
+# metadados, ex.:
+#   en: - Your Highlight on page 12 | location 180-182 | Added on Sunday, January 9, 2024 8:30:00 AM
+#   pt: - Seu destaque na página 12 | posição 180-182 | Adicionado: domingo, 9 de janeiro de 2024 08:30:00
+#   es: - Tu subrayado en la página 12 | posición 180-182 | Añadido el domingo, 9 de enero de 2024 8:30:00
+LOCALES = {
+    "en": {
+        "highlight": ["highlight"],
+        "note": ["note"],
+        "bookmark": ["bookmark"],
+        "page": ["page"],
+        "location": ["location"],
+        "added": [r"added\s+on"],
+        "months": [
+            "january", "february", "march", "april", "may", "june", "july",
+            "august", "september", "october", "november", "december",
+        ],
+    },
+    "pt": {
+        "highlight": ["destaque"],
+        "note": ["nota"],
+        "bookmark": ["marcador"],
+        "page": ["página"],
+        "location": ["posição"],
+        "added": [r"adicionado(?:\s+em)?:?"],
+        "months": [
+            "janeiro", "fevereiro", "março", "abril", "maio", "junho", "julho",
+            "agosto", "setembro", "outubro", "novembro", "dezembro",
+        ],
+    },
+    "es": {
+        "highlight": ["subrayado"],
+        "note": ["nota"],
+        "bookmark": ["marcador"],
+        "page": ["página"],
+        "location": ["posición"],
+        "added": [r"añadido(?:\s+el)?:?"],
+        "months": [
+            "enero", "febrero", "marzo", "abril", "mayo", "junio", "julio",
+            "agosto", "septiembre", "octubre", "noviembre", "diciembre",
+        ],
+    },
+}
+
+KIND_HIGHLIGHT = "highlight"
+KIND_NOTE = "note"
+KIND_BOOKMARK = "bookmark"
+
+
+def _alternation(key: str) -> str:
+    fragments = {f for locale in LOCALES.values() for f in locale[key]}
+    return "|".join(sorted(fragments, key=len, reverse=True))
+
+
+_KIND_BY_WORD = {
+    word: kind
+    for locale in LOCALES.values()
+    for kind in (KIND_HIGHLIGHT, KIND_NOTE, KIND_BOOKMARK)
+    for word in locale[kind]
+}
+
+_MONTHS = {
+    name: number
+    for locale in LOCALES.values()
+    for number, name in enumerate(locale["months"], start=1)
+}
+_MONTHS["setiembre"] = 9
+
+
+_META_RE = re.compile(
+    rf"""
+    ^\W*(?:\w+\s+)?
+    (?P<kind>{"|".join(sorted(_KIND_BY_WORD, key=len, reverse=True))})\b
+    [^|]*?
+    (?:\b(?:{_alternation("page")})\s+(?P<page>\w+)[^|]*)?
+    (?:\|[^|]*?)?
+    \b(?:{_alternation("location")})\s+(?P<start>\d+)(?:-(?P<end>\d+))?
+    .*?
+    (?:\b(?:{_alternation("added")})\s*(?P<added>.+?))?
+    \s*$
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+_TIMESTAMP_RE = re.compile(
+    r"""
+    (?:[^\W\d_][\w-]*,?\s+)?
+    (?:
+        (?P<month_us>[^\W\d_]+)\s+(?P<day_us>\d{1,2}),?\s+(?P<year_us>\d{4})
+      | (?P<day>\d{1,2})\s+(?:de\s+)?(?P<month>[^\W\d_]+)\.?\s+(?:de\s+)?(?P<year>\d{4})
+    )
+    [,\s]+(?P<hour>\d{1,2}):(?P<minute>\d{2})(?::(?P<second>\d{2}))?
+    (?:\s*(?P<ampm>[ap])\.?\s?m\.?)?
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+
+@dataclass(slots=True)
+class MetaInfo:
+    kind: str
+    page: int | None
+    location_start: int
+    location_end: int
+    added_at: int
+
+
+def parse_timestamp(added_at: str) -> int:
+    """
+    Converte o texto do "Added on / Adicionado / Añadido" em epoch
+    (segundos, sem fuso). Retorna 0 quando ausente ou não reconhecido —
+    sempre o mais antigo.
+    """
+    if not added_at:
+        return 0
+
+    m = _TIMESTAMP_RE.search(added_at)
+    if not m:
+        return 0
+
+    if m.group("month_us"):
+        month_name, day, year = m.group("month_us", "day_us", "year_us")
+    else:
+        month_name, day, year = m.group("month", "day", "year")
+
+    month = _MONTHS.get(month_name.lower())
+    if month is None:
+        return 0
+
+    hour = int(m.group("hour"))
+    ampm = (m.group("ampm") or "").lower()
+    if ampm == "p" and hour < 12:
+        hour += 12
+    elif ampm == "a" and hour == 12:
+        hour = 0
+
+    try:
+        return calendar.timegm((
+            int(year), month, int(day),
+            hour, int(m.group("minute")), int(m.group("second") or 0),
+        ))
+    except ValueError:
+        return 0
+
+
+def parse_meta(meta_info: str) -> MetaInfo | None:
+    """
+    Extrai tipo, página, posição e data da linha de metadados em um único
+    match. Retorna None quando não há posição (linha não reconhecida).
+    """
+    m = _META_RE.match(meta_info)
+    if not m:
+        return None
+
+    page = None
+    if m.group("page"):
+        try:
+            page = int(m.group("page"))
+        except ValueError:
+            page = None
+
+    loc_start = int(m.group("start"))
+    loc_end = int(m.group("end")) if m.group("end") else loc_start
+
+    return MetaInfo(
+        kind=_KIND_BY_WORD[m.group("kind").lower()],
+        page=page,
+        location_start=loc_start,
+        location_end=loc_end,
+        added_at=parse_timestamp(m.group("added") or ""),
+    )
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass, field
+
+
+def intern_str(value: str) -> str:
+    # títulos / autores se repetem em milhares de registros
+    return sys.intern(value)
+
+
+@dataclass(slots=True)
+class Note:
+    book: str
+    author: str
+    page: int | None
+    location: int
+    added_at: int
+    type: int
+    note: str
+    seq: int = 0
+
+
+@dataclass(slots=True)
+class Highlight:
+    book: str
+    author: str
+    page: int | None
+    location_start: int
+    location_end: int
+    added_at: int
+    quote: str
+    notes: list[Note] = field(default_factory=list)
+    seq: int = 0
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from importer.config import SOURCE_STATE_FILE
+
+
+SOURCE_STATE_VERSION = 1
+
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+def _hash_file(input_file: Path) -> str:
+    digest = hashlib.sha256()
+    with open(input_file, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _load(path: Path) -> dict | None:
+    if not path.exists():
+        return None
+
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        print("⚠️ Fingerprint da fonte corrompido — ignorado.")
+        return None
+
+    if data.get("version") != SOURCE_STATE_VERSION:
+        return None
+
+    return data
+
+
+def source_fingerprint(source, found, path: Path = SOURCE_STATE_FILE) -> tuple[dict, bool]:
+    """
+    Fingerprint (tamanho, mtime, sha256) do My Clippings.txt localizado
+    (source / found de locate_clippings), antes de qualquer cópia, e se ele
+    é igual ao do último run concluído.
+
+    Mesma origem com tamanho e mtime iguais basta (sem ler o arquivo).
+    Senão, para arquivos locais decide o hash do conteúdo (ex.: o backup
+    com o mesmo conteúdo do último Kindle); fontes que não dá para ler sem
+    copiar (MTP) contam como mudadas.
+
+    Estrutura salva:
+        {
+            "version": 1,
+            "source": "<origem do My Clippings.txt>",
+            "size": <bytes>,
+            "mtime_ns": <mtime em ns>,
+            "sha256": "..."
+        }
+    """
+    size, mtime_ns = source.stat(found)
+    current = {
+        "version": SOURCE_STATE_VERSION,
+        "source": source.label(found),
+        "size": size,
+        "mtime_ns": mtime_ns,
+        "sha256": None,
+    }
+
+    saved = _load(path)
+    if saved is None or saved.get("size") != size:
+        return current, False
+
+    if saved.get("source") == current["source"] and saved.get("mtime_ns") == mtime_ns:
+        current["sha256"] = saved.get("sha256")
+        return current, True
+
+    if not isinstance(found, Path):
+        return current, False
+
+    current["sha256"] = _hash_file(found)
+    unchanged = current["sha256"] == saved.get("sha256")
+
+    if unchanged:
+        # mesmo conteúdo: grava origem / mtime novos para o próximo run não reler
+        save_source_fingerprint(current, found, path)
+
+    return current, unchanged
+
+
+def save_source_fingerprint(fingerprint: dict, processed_file: Path, path: Path = SOURCE_STATE_FILE):
+    """
+    Persiste o fingerprint da fonte processada, de forma atômica
+    (tmp + replace). Só deve ser chamado depois de um run completo;
+    sem hash ainda, ele é calculado do arquivo processado (a cópia).
+    """
+    data = dict(fingerprint)
+    if data["sha256"] is None:
+        data["sha256"] = _hash_file(processed_file)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(data), encoding="utf-8")
+    os.replace(tmp, path)
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+
+from importer.config import VOCABULARY_INFLECTIONS
+
+
+_TOKEN_RE = re.compile(r"\w+")
+
+_VOWELS = "aeiou"
+
+
+@lru_cache(maxsize=4096)
+def _word_pattern(word: str) -> re.Pattern:
+    return re.compile(rf"\b{re.escape(word)}\b")
+
+
+# CVC sem sílaba tônica final: não dobram a consoante (visited, opening)
+_NO_DOUBLING = frozenset({
+    "answer", "bother", "budget", "cancel", "consider", "cover", "credit",
+    "deliver", "develop", "discover", "edit", "enter", "gather", "happen",
+    "label", "level", "limit", "listen", "model", "murmur", "offer", "open",
+    "order", "profit", "remember", "signal", "suffer", "target", "travel",
+    "visit", "wander", "whisper", "wonder",
+})
+
+
+# palavras curtas que não são verbos: sem -ed / -ing (hat → hatted, not → notted)
+_NO_VERB_FORMS = frozenset({
+    "bad", "big", "but", "car", "cat", "dog", "far", "for", "god", "hat",
+    "her", "him", "his", "hot", "its", "man", "men", "nor", "not", "our",
+    "red", "sad", "sun", "ten", "war", "wet", "yet",
+})
+
+
+def _doubles_final_consonant(word: str) -> bool:
+    # stop → stopped / stopping
+    return (
+        word[-1] not in _VOWELS + "wxy"
+        and word[-2] in _VOWELS
+        and word[-3] not in _VOWELS
+        and word not in _NO_DOUBLING
+    )
+
+
+@lru_cache(maxsize=4096)
+def inflected_forms(word: str) -> frozenset[str]:
+    """
+    Formas simples em inglês a partir do termo anotado:
+    plural (-s / -es / -ies), passado (-ed / -d / -ied) e gerúndio (-ing).
+    Termos com menos de 3 letras não são flexionados.
+    """
+    forms = {word}
+    if len(word) < 3:
+        return frozenset(forms)
+
+    consonant_y = word.endswith("y") and word[-2] not in _VOWELS
+
+    if word.endswith(("s", "x", "z", "ch", "sh")):
+        forms.add(word + "es")
+    elif consonant_y:
+        forms.add(word[:-1] + "ies")
+    else:
+        forms.add(word + "s")
+
+    if word in _NO_VERB_FORMS:
+        return frozenset(forms)
+
+    if word.endswith("e"):
+        forms.add(word + "d")
+        forms.add(word + "ing" if word.endswith("ee") else word[:-1] + "ing")
+    elif consonant_y:
+        forms.add(word[:-1] + "ied")
+        forms.add(word + "ing")
+    elif _doubles_final_consonant(word):
+        forms.add(word + word[-1] + "ed")
+        forms.add(word + word[-1] + "ing")
+    else:
+        forms.add(word + "ed")
+        forms.add(word + "ing")
+
+    return frozenset(forms)
+
+
+class VocabularyMatcher:
+    """
+    Verifica se o termo de vocabulário aparece no trecho destacado.
+
+    Cada trecho é tokenizado uma única vez; termos de uma palavra viram
+    consulta no conjunto de tokens (equivale ao antigo \\bword\\b).
+    Expressões com espaço / pontuação usam o regex compilado em cache.
+    """
+
+    def __init__(self, inflections: bool = VOCABULARY_INFLECTIONS):
+        self.inflections = inflections
+
+    def _single_token_match(self, word: str, tokens: set[str]) -> bool:
+        if word in tokens:
+            return True
+        if not self.inflections:
+            return False
+        return not inflected_forms(word).isdisjoint(tokens)
+
+    def match_all(self, candidates: list[tuple[str, str]]) -> list[bool]:
+        """
+        candidates: (word, text) de um livro. Retorna um bool por candidato.
+        """
+        tokens_by_text: dict[str, tuple[str, set[str]]] = {}
+        results: list[bool] = []
+
+        for word, text in candidates:
+            if not word or not text:
+                results.append(False)
+                continue
+
+            cached = tokens_by_text.get(text)
+            if cached is None:
+                text_lower = text.lower()
+                cached = (text_lower, set(_TOKEN_RE.findall(text_lower)))
+                tokens_by_text[text] = cached
+
+            text_lower, tokens = cached
+            word_lower = word.lower()
+
+            if _TOKEN_RE.fullmatch(word_lower):
+                results.append(self._single_token_match(word_lower, tokens))
+            else:
+                results.append(_word_pattern(word_lower).search(text_lower) is not None)
+
+        return results
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import os
+from bisect import bisect_left
+from pathlib import Path
+from typing import Iterable
+
+from importer.config import GLOSSARY_FILE, GLOSSARY_OVERRIDES_FILE
+
+
+def glossary_key(word: str) -> str:
+    return " ".join(word.split()).lower()
+
+
+def _read_tsv(path: Path) -> dict[str, str]:
+    """
+    Uma entrada por linha: termo<TAB>tradução. Linhas vazias, comentários
+    (#) e linhas sem tradução são ignoradas.
+    """
+    entries: dict[str, str] = {}
+    if not path.exists():
+        return entries
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip() or line.startswith("#"):
+                continue
+
+            term, _, translation = line.rstrip("\n").partition("\t")
+            term, translation = glossary_key(term), translation.strip()
+            if term and translation:
+                entries[term] = translation
+
+    return entries
+
+
+def _clean(value: str) -> str:
+    # TAB / quebra de linha quebrariam o formato
+    return " ".join(value.split())
+
+
+class Glossary:
+    """
+    Glossário local de termos isolados, consultado antes do
+    TranslationService.
+
+    Arquivos:
+        GLOSSARY_FILE            aprendido do DB (reescrito pelo import)
+        GLOSSARY_OVERRIDES_FILE  editado à mão; sempre tem precedência
+
+    Carregado sob demanda em dois arrays ordenados (termos / traduções);
+    a busca é um bisect.
+    """
+
+    def __init__(
+        self,
+        path: Path = GLOSSARY_FILE,
+        overrides_path: Path = GLOSSARY_OVERRIDES_FILE,
+    ):
+        self.path = path
+        self.overrides_path = overrides_path
+
+        self._learned: dict[str, str] = {}
+        self._overrides: dict[str, str] = {}
+        self._terms: list[str] | None = None
+        self._translations: list[str] = []
+
+    def _ensure_loaded(self):
+        if self._terms is not None:
+            return
+
+        self._learned = _read_tsv(self.path)
+        self._overrides = _read_tsv(self.overrides_path)
+        self._build()
+
+    def _build(self):
+        merged = {**self._learned, **self._overrides}
+        self._terms = sorted(merged)
+        self._translations = [merged[t] for t in self._terms]
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._terms)
+
+    def get(self, word: str) -> str | None:
+        self._ensure_loaded()
+        key = glossary_key(word)
+
+        i = bisect_left(self._terms, key)
+        if i < len(self._terms) and self._terms[i] == key:
+            return self._translations[i]
+
+        return None
+
+    def learn(self, pairs: Iterable[tuple[str, str]]) -> int:
+        """
+        Incorpora pares (termo, tradução) confirmados e regrava o
+        GLOSSARY_FILE se algo mudou. Retorna quantos termos mudaram.
+        """
+        self._ensure_loaded()
+
+        changed = 0
+        for word, translation in pairs:
+            key, translation = glossary_key(word), _clean(translation)
+            if not key or not translation:
+                continue
+
+            if self._learned.get(key) != translation:
+                self._learned[key] = translation
+                changed += 1
+
+        if changed:
+            self._save()
+            self._build()
+
+        return changed
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+
+        with open(tmp, "w", encoding="utf-8") as f:
+            for term in sorted(self._learned):
+                f.write(f"{term}\t{self._learned[term]}\n")
+
+        os.replace(tmp, self.path)
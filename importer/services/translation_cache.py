@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from importer.config import TRANSLATION_CACHE_FILE, TRANSLATION_CACHE_MAX_ENTRIES
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(text.split())
+
+
+def cache_key(text: str, source: str, target: str) -> str:
+    normalized = normalize_text(text)
+    digest = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+    return f"{source}|{target}|{digest}"
+
+
+class TranslationCache:
+    """
+    Cache persistente de traduções (SQLite), chave
+    (idioma origem, idioma destino, sha256 do texto normalizado).
+
+    Eviction LRU: acima de max_entries, as entradas usadas há mais tempo
+    são removidas. Thread-safe (usado pelo pool de tradução).
+    """
+
+    def __init__(
+        self,
+        path: Path = TRANSLATION_CACHE_FILE,
+        max_entries: int = TRANSLATION_CACHE_MAX_ENTRIES,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+        self._lock = threading.Lock()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            path,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS translations (
+                key TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                target TEXT NOT NULL,
+                text TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                used_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS translations_used_at ON translations (used_at)"
+        )
+        self._size = self._conn.execute("SELECT count(*) FROM translations").fetchone()[0]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def get(self, text: str, source: str, target: str) -> str | None:
+        key = cache_key(text, source, target)
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT translation FROM translations WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE translations SET used_at = ? WHERE key = ?",
+                (time.time(), key),
+            )
+            return row[0]
+
+    def put(self, text: str, translation: str, source: str, target: str):
+        key = cache_key(text, source, target)
+
+        with self._lock:
+            now = time.time()
+            cursor = self._conn.execute(
+                """
+                INSERT OR IGNORE INTO translations
+                    (key, source, target, text, translation, used_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (key, source, target, normalize_text(text), translation, now),
+            )
+
+            if cursor.rowcount == 1:
+                self._size += 1
+            else:
+                self._conn.execute(
+                    "UPDATE translations SET translation = ?, used_at = ? WHERE key = ?",
+                    (translation, now, key),
+                )
+
+            if self._size > self.max_entries:
+                self._evict(self._size - self.max_entries)
+
+    def _evict(self, count: int):
+        self._conn.execute(
+            """
+            DELETE FROM translations WHERE key IN (
+                SELECT key FROM translations ORDER BY used_at LIMIT ?
+            )
+            """,
+            (count,),
+        )
+        self._size -= count
+        self.evicted += count
+
+    def summary(self) -> str:
+        return (
+            f"hits: {self.hits} | misses: {self.misses} | "
+            f"entries: {self._size} | evicted: {self.evicted}"
+        )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
+
+from importer.config import TRANSLATION_BURST, TRANSLATION_RATE, TRANSLATION_WORKERS
+from importer.services.translation_service import TranslationService, pack_segments
+
+
+class TokenBucket:
+    """
+    Rate limiter thread-safe: até `capacity` requisições de uma vez,
+    reabastecido a `rate` tokens por segundo. rate <= 0 desliga o limite.
+    """
+
+    def __init__(self, rate: float, capacity: int | None = None):
+        self.rate = rate
+        self.capacity = capacity or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._updated) * self.rate,
+                )
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+
+def translate_all(
+    texts: Iterable[str],
+    workers: int = TRANSLATION_WORKERS,
+    rate: float = TRANSLATION_RATE,
+    burst: int = TRANSLATION_BURST,
+) -> dict[str, str | Exception]:
+    """
+    Traduz os textos (sem repetição): o que está no cache sai direto;
+    o resto é empacotado (pack_segments) e os pacotes vão em um pool de
+    threads limitado por um token bucket (um token por requisição).
+
+    Retorna {texto: tradução}; a falha de um texto vira a exceção no
+    lugar da tradução, sem derrubar os demais.
+    """
+    unique = list(dict.fromkeys(texts))
+    if not unique:
+        return {}
+
+    started = time.monotonic()
+
+    results: dict[str, str | Exception] = {}
+    found, missing = TranslationService.lookup(unique)
+    results.update(found)
+
+    batches = pack_segments(missing)
+    bucket = TokenBucket(rate, burst)
+
+    def run(batch: list[str]) -> dict[str, str | Exception]:
+        return TranslationService.translate_batch(batch, acquire=bucket.acquire)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for translated in pool.map(run, batches):
+            results.update(translated)
+
+    failed = sum(1 for r in results.values() if isinstance(r, Exception))
+    print(
+        f"🌍 Translation pool | {len(unique)} texts | {len(found)} cached | "
+        f"{len(batches)} batches | {failed} failed | "
+        f"{time.monotonic() - started:.1f}s"
+    )
+
+    return results
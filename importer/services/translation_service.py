@@ -1,10 +1,123 @@
 from __future__ import annotations
 
+import random
+import threading
+import time
+from typing import Callable, Iterable
+
 import requests
+from requests.adapters import HTTPAdapter
+
+from importer.config import (
+    TRANSLATION_BACKOFF,
+    TRANSLATION_BACKOFF_MAX,
+    TRANSLATION_BATCH_CHARS,
+    TRANSLATION_BATCH_SEGMENTS,
+    TRANSLATION_ENDPOINT,
+    TRANSLATION_OFFLINE,
+    TRANSLATION_RETRIES,
+    TRANSLATION_TIMEOUT,
+    TRANSLATION_WORKERS,
+)
+from importer.services.translation_cache import TranslationCache
+
+
+SOURCE_LANG = "en"
+TARGET_LANG = "pt"
+
+# respostas que valem nova tentativa
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# segmentos empacotados numa requisição, um por linha
+SEGMENT_DELIMITER = "\n"
+
+
+class TranslationNotCached(ValueError):
+    """Modo offline e o texto não está no cache."""
+
+
+def _backoff_delay(attempt: int, retry_after: str | None = None) -> float:
+    """
+    Exponencial com jitter ("full jitter"), limitado a TRANSLATION_BACKOFF_MAX.
+    Um Retry-After numérico do servidor tem precedência.
+    """
+    if retry_after and retry_after.strip().isdigit():
+        return min(float(retry_after), TRANSLATION_BACKOFF_MAX)
+
+    ceiling = min(TRANSLATION_BACKOFF_MAX, TRANSLATION_BACKOFF * (2 ** attempt))
+    return random.uniform(0, ceiling)
+
+
+def pack_segments(
+    texts: Iterable[str],
+    max_chars: int = TRANSLATION_BATCH_CHARS,
+    max_segments: int = TRANSLATION_BATCH_SEGMENTS,
+) -> list[list[str]]:
+    """
+    Agrupa os textos em pacotes de até max_chars / max_segments.
+    Texto com quebra de linha (ambíguo no split) ou maior que o orçamento
+    vai sozinho.
+    """
+    batches: list[list[str]] = []
+    current: list[str] = []
+    size = 0
+
+    for text in texts:
+        if SEGMENT_DELIMITER in text or len(text) >= max_chars:
+            batches.append([text])
+            continue
+
+        if current and (
+            size + len(text) + 1 > max_chars or len(current) >= max_segments
+        ):
+            batches.append(current)
+            current, size = [], 0
+
+        current.append(text)
+        size += len(text) + 1
+
+    if current:
+        batches.append(current)
+
+    return batches
 
 
 class TranslationService:
-    _endpoint = "https://translate.googleapis.com/translate_a/single"
+    endpoint = TRANSLATION_ENDPOINT
+    timeout = TRANSLATION_TIMEOUT
+    retries = TRANSLATION_RETRIES
+
+    # modo offline: só responde do cache, nunca vai à rede
+    offline = TRANSLATION_OFFLINE
+
+    _cache: TranslationCache | None = None
+    _session: requests.Session | None = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def cache(cls) -> TranslationCache:
+        with cls._lock:
+            if cls._cache is None:
+                cls._cache = TranslationCache()
+            return cls._cache
+
+    @classmethod
+    def session(cls) -> requests.Session:
+        """
+        Session compartilhada pelas threads do pool: keep-alive e uma
+        conexão por worker.
+        """
+        with cls._lock:
+            if cls._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=max(1, TRANSLATION_WORKERS),
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                cls._session = session
+            return cls._session
 
     @staticmethod
     def translate_to_pt_br(text: str) -> str:
@@ -12,16 +125,153 @@ class TranslationService:
         if not t:
             return ""
 
+        cache = TranslationService.cache()
+
+        cached = cache.get(t, SOURCE_LANG, TARGET_LANG)
+        if cached is not None:
+            return cached
+
+        if TranslationService.offline:
+            raise TranslationNotCached("Offline mode: translation not cached")
+
+        translated = TranslationService._fetch(t)
+        cache.put(t, translated, SOURCE_LANG, TARGET_LANG)
+
+        return translated
+
+    @staticmethod
+    def lookup(texts: Iterable[str]) -> tuple[dict[str, str], list[str]]:
+        """
+        Separa os textos (já sem espaços nas pontas) entre os que estão no
+        cache e os que precisam ir à rede.
+        """
+        cache = TranslationService.cache()
+        found: dict[str, str] = {}
+        missing: list[str] = []
+
+        for t in texts:
+            cached = cache.get(t, SOURCE_LANG, TARGET_LANG)
+            if cached is None:
+                missing.append(t)
+            else:
+                found[t] = cached
+
+        return found, missing
+
+    @staticmethod
+    def translate_batch(
+        texts: list[str],
+        acquire: Callable[[], None] | None = None,
+    ) -> dict[str, str | Exception]:
+        """
+        Traduz um pacote de pack_segments em uma requisição.
+
+        Se o número de linhas devolvidas não bate com o de segmentos
+        (ou o pacote falha), cai para uma requisição por segmento.
+        A falha de um segmento vira a exceção no lugar da tradução.
+        acquire é chamado antes de cada requisição (rate limit).
+        """
+        if TranslationService.offline:
+            return {
+                t: TranslationNotCached("Offline mode: translation not cached")
+                for t in texts
+            }
+
+        acquire = acquire or (lambda: None)
+        results: dict[str, str | Exception] = {}
+
+        if len(texts) > 1:
+            try:
+                acquire()
+                lines = TranslationService._fetch_raw(
+                    SEGMENT_DELIMITER.join(texts)
+                ).strip(SEGMENT_DELIMITER).split(SEGMENT_DELIMITER)
+                lines = [line.strip() for line in lines]
+
+                if len(lines) == len(texts) and all(lines):
+                    results = dict(zip(texts, lines))
+                else:
+                    print(
+                        f"⚠️ Translation batch misaligned | "
+                        f"{len(texts)} segments → {len(lines)} lines | "
+                        f"falling back to single requests"
+                    )
+            except Exception as e:
+                print(
+                    f"⚠️ Translation batch failed | {len(texts)} segments | {e} | "
+                    f"falling back to single requests"
+                )
+
+        for t in texts:
+            if t in results:
+                continue
+            try:
+                acquire()
+                results[t] = TranslationService._fetch(t)
+            except Exception as e:
+                results[t] = e
+
+        cache = TranslationService.cache()
+        for t, translated in results.items():
+            if isinstance(translated, str):
+                cache.put(t, translated, SOURCE_LANG, TARGET_LANG)
+
+        return results
+
+    @staticmethod
+    def _get(params: dict) -> requests.Response:
+        """
+        GET com retries (backoff exponencial + jitter) em 429 / 5xx e em
+        falhas de conexão / timeout. Esgotadas as tentativas, o último erro
+        é propagado.
+        """
+        session = TranslationService.session()
+
+        for attempt in range(TranslationService.retries + 1):
+            last_attempt = attempt == TranslationService.retries
+
+            try:
+                res = session.get(
+                    TranslationService.endpoint,
+                    params=params,
+                    timeout=TranslationService.timeout,
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                if last_attempt:
+                    raise
+                time.sleep(_backoff_delay(attempt))
+                continue
+
+            if res.status_code in RETRY_STATUSES and not last_attempt:
+                time.sleep(_backoff_delay(attempt, res.headers.get("Retry-After")))
+                continue
+
+            res.raise_for_status()
+            return res
+
+    @staticmethod
+    def _fetch(t: str) -> str:
+        translated = TranslationService._fetch_raw(t).strip()
+        if not translated:
+            raise ValueError("Empty translation")
+
+        return translated
+
+    @staticmethod
+    def _fetch_raw(t: str) -> str:
+        """
+        Uma requisição; devolve as partes traduzidas concatenadas, com as
+        quebras de linha preservadas.
+        """
         params = {
             "client": "gtx",
-            "sl": "en",
-            "tl": "pt",
+            "sl": SOURCE_LANG,
+            "tl": TARGET_LANG,
             "dt": "t",
             "q": t,
         }
 
-        res = requests.get(TranslationService._endpoint, params=params, timeout=15)
-        res.raise_for_status()
+        res = TranslationService._get(params)
 
         data = res.json()
 
@@ -33,8 +283,4 @@ class TranslationService:
             if isinstance(part, list) and part and isinstance(part[0], str):
                 translated_parts.append(part[0])
 
-        translated = "".join(translated_parts).strip()
-        if not translated:
-            raise ValueError("Empty translation")
-
-        return translated
+        return "".join(translated_parts)